@@ -0,0 +1,179 @@
+import asyncio
+import os
+import signal
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from scraperAbans import create_chrome_driver
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def _children_by_parent() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # The command name may contain spaces, so split after its closing paren
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def _process_tree(pid: int) -> List[int]:
+    """pid plus all of its descendants (Linux only; just [pid] elsewhere)."""
+    if not os.path.isdir("/proc"):
+        return [pid]
+    children = _children_by_parent()
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(children.get(current, []))
+    return tree
+
+
+def _rss_mb(pids: List[int]) -> Optional[float]:
+    total_kb, seen = 0, False
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        seen = True
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024 if seen else None
+
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+    @property
+    def pid(self) -> Optional[int]:
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        return process.pid if process else None
+
+    def rss_mb(self) -> Optional[float]:
+        return _rss_mb(_process_tree(self.pid)) if self.pid else None
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Failed to quit browser cleanly, killing it: {e}")
+            self.kill()
+
+    def kill(self):
+        """Hard-kill chromedriver and every Chrome process it spawned."""
+        if not self.pid:
+            return
+        for pid in reversed(_process_tree(self.pid)):
+            try:
+                os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+            except OSError:
+                pass
+
+
+class BrowserPool:
+    """
+    A capped pool of headless Chrome drivers shared by all scrapers.
+
+    Tasks check a driver out for their duration. Drivers are recycled after
+    `max_pages` tasks or once their process tree exceeds `max_rss_mb`, and a
+    task running longer than `task_timeout` seconds gets its browser killed.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        max_rss_mb: Optional[float] = None,
+        task_timeout: Optional[float] = None,
+        driver_factory: Callable[[], Any] = create_chrome_driver,
+    ):
+        self.max_size = int(max_size or _env_number("BROWSER_POOL_SIZE", 2))
+        self.max_pages = int(max_pages or _env_number("BROWSER_MAX_PAGES", 25))
+        self.max_rss_mb = max_rss_mb or _env_number("BROWSER_MAX_RSS_MB", 1500)
+        self.task_timeout = task_timeout or _env_number("BROWSER_TASK_TIMEOUT", 120)
+        self.driver_factory = driver_factory
+        self._idle: List[PooledDriver] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._live = 0
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_size)
+        return self._slots
+
+    async def _checkout(self) -> PooledDriver:
+        if self._idle:
+            return self._idle.pop()
+        driver = await asyncio.to_thread(self.driver_factory)
+        self._live += 1
+        return PooledDriver(driver)
+
+    async def _retire(self, pooled: PooledDriver, kill: bool = False):
+        self._live -= 1
+        if kill:
+            await asyncio.to_thread(pooled.kill)
+        else:
+            await asyncio.to_thread(pooled.quit)
+
+    async def _checkin(self, pooled: PooledDriver):
+        pooled.pages += 1
+        rss = await asyncio.to_thread(pooled.rss_mb)
+        if pooled.pages >= self.max_pages or (rss is not None and rss > self.max_rss_mb):
+            print(f"Recycling browser after {pooled.pages} pages ({rss or 0:.0f} MB)")
+            await self._retire(pooled)
+        else:
+            self._idle.append(pooled)
+
+    async def run(self, task: Callable[[Any], Any]) -> Any:
+        """Run the blocking `task(driver)` in a thread on a pooled driver."""
+        async with self.slots:
+            pooled = await self._checkout()
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.to_thread(task, pooled.driver), timeout=self.task_timeout
+                )
+            except asyncio.TimeoutError:
+                print(f"Browser task exceeded {self.task_timeout:.0f}s, killing driver")
+                await self._retire(pooled, kill=True)
+                raise
+            except BaseException:
+                # The page may be left in any state; don't hand it to the next task
+                await self._retire(pooled)
+                raise
+            await self._checkin(pooled)
+            return result
+
+    async def release_idle(self):
+        """Quit idle drivers, e.g. between scheduled scrape runs."""
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._retire(pooled)
+
+    async def close(self):
+        await self.release_idle()
+
+    def stats(self) -> dict:
+        return {"live": self._live, "idle": len(self._idle), "max_size": self.max_size}
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,148 @@
+import os
+import re
+from typing import Iterable, List, Optional
+
+from models import LaptopCategory
+from prompt_serializer import serialize_product
+
+# Bump when the rules change; products stored under an older version are reclassified
+CATEGORY_RULES_VERSION = 1
+CATEGORY_LLM_FALLBACK = (os.getenv("CATEGORY_LLM_FALLBACK") or "true").lower() in ("1", "true", "yes")
+
+CPU_TIER = re.compile(r"\b(?:core\s*(?:i|ultra\s*)|ryzen(?:™)?\s*)([3579])", re.IGNORECASE)
+ENTRY_CPU = re.compile(r"\b(?:pentium|celeron|athlon)", re.IGNORECASE)
+MEMORY_SIZE = re.compile(r"(\d+)\s*(GB|TB)", re.IGNORECASE)
+# Discrete GPUs built for games; GeForce MX is dedicated but entry level
+GAMING_GPU = re.compile(r"\b(?:rtx|gtx|radeon(?:™)?\s*rx)\b", re.IGNORECASE)
+VPRO = re.compile(r"vpro", re.IGNORECASE)
+
+
+def _strings(specs: dict, *fields: str) -> List[str]:
+    values = []
+    for name in fields:
+        value = specs.get(name)
+        if isinstance(value, str):
+            values.append(value)
+        elif isinstance(value, (list, tuple)):
+            values.extend(str(item) for item in value)
+    return values
+
+
+def cpu_tier(specs: dict) -> Optional[int]:
+    """Highest CPU tier offered: 3/5/7/9 for Core iN / Ultra N / Ryzen N, 1 for Pentium-class parts."""
+    tiers = []
+    for text in _strings(specs, "processor_models", "processor_family", "processor"):
+        tiers.extend(int(tier) for tier in CPU_TIER.findall(text))
+        if ENTRY_CPU.search(text):
+            tiers.append(1)
+    return max(tiers) if tiers else None
+
+
+def max_memory_gb(specs: dict) -> Optional[int]:
+    sizes = [
+        int(amount) * (1024 if unit.upper() == "TB" else 1)
+        for text in _strings(specs, "max_memory", "memory")
+        for amount, unit in MEMORY_SIZE.findall(text)
+    ]
+    return max(sizes) if sizes else None
+
+
+def _any(pattern: re.Pattern, texts: Iterable[str]) -> bool:
+    return any(pattern.search(text) for text in texts)
+
+
+def classify_specs(specs: dict) -> Optional[LaptopCategory]:
+    """
+    Rule-based category from parsed technical specs, or None when they say too little.
+
+    Gaming needs a gaming GPU with no evidence of a weak CPU or under 16GB of RAM.
+    Business needs a Core i5/Ryzen 5 class CPU or better plus a business feature
+    (vPro, MIL-STD testing, or a fingerprint reader with a TPM). Everything else
+    with a known CPU or memory size is general.
+    """
+    specs = specs or {}
+    tier = cpu_tier(specs)
+    memory = max_memory_gb(specs)
+
+    if _any(GAMING_GPU, _strings(specs, "graphics_options", "graphics")):
+        if (tier is None or tier >= 5) and (memory is None or memory >= 16):
+            return LaptopCategory.GAMING
+
+    business_feature = (
+        bool(specs.get("mil_certification"))
+        or _any(VPRO, _strings(specs, "processor_models", "processor_family", "processor"))
+        or (bool(specs.get("fingerprint_reader")) and bool(specs.get("security_chip")))
+    )
+    if business_feature and tier is not None and tier >= 5:
+        return LaptopCategory.BUSINESS
+
+    if tier is not None or memory is not None:
+        return LaptopCategory.GENERAL
+    return None
+
+
+def parse_category(answer: str) -> Optional[LaptopCategory]:
+    """First category named in a free-text LLM answer."""
+    found = re.search(r"general|business|gaming", answer or "", re.IGNORECASE)
+    return LaptopCategory(found.group(0).lower()) if found else None
+
+
+async def categorize(product: dict, llm_service=None) -> dict:
+    """
+    Category fields to store on `product`.
+
+    Rules decide whenever the specs allow it; otherwise, if CATEGORY_LLM_FALLBACK
+    is on and `llm_service` is given, the model is asked once. Either way the
+    attempt is stamped with `category_version`, so it isn't repeated until the
+    rules change. An undecided attempt never clears an existing category; a
+    product without one is marked with source "unknown".
+    """
+    category = classify_specs(product.get("technical_specs"))
+    source = "rules"
+    if category is None and CATEGORY_LLM_FALLBACK and llm_service is not None:
+        try:
+            category = parse_category(await llm_service.classify_laptop(serialize_product(product)))
+            source = "llm"
+        except Exception as e:
+            print(f"[Categorizer] LLM fallback failed for {product.get('sku')}: {e}")
+    if category is not None:
+        return {
+            "category": category.value,
+            "category_source": source,
+            "category_version": CATEGORY_RULES_VERSION,
+        }
+    if product.get("category"):
+        return {"category_version": CATEGORY_RULES_VERSION}
+    return {"category_source": "unknown", "category_version": CATEGORY_RULES_VERSION}
+
+
+async def backfill_categories(database, writer, llm_service=None) -> int:
+    """
+    Categorize stored products that predate the current rules version.
+
+    Only fields that actually change are written, so listeners (and the summary
+    cache they invalidate) are not triggered by no-op updates. Returns how many
+    products were updated.
+    """
+    count = 0
+    cursor = database.products.find(
+        {"category_version": {"$ne": CATEGORY_RULES_VERSION}},
+        {
+            "sku": 1,
+            "canonical_name": 1,
+            "brand": 1,
+            "technical_specs": 1,
+            "category": 1,
+            "category_source": 1,
+            "category_version": 1,
+        },
+    )
+    async for product in cursor:
+        fields = await categorize(product, llm_service)
+        changes = {key: value for key, value in fields.items() if product.get(key) != value}
+        if changes:
+            await writer.update(product["sku"], {"$set": changes})
+            count += 1
+    if count:
+        print(f"[Categorizer] recategorized {count} products")
+    return count
@@ -19,12 +19,8 @@ class MongoDB:
         
         self.client = AsyncIOMotorClient(MONGODB_URL)
         self.database = self.client[DB_NAME]
-        
-        # Create indexes
-        await self.database.products.create_index("sku", unique=True)
-        await self.database.products.create_index("brand")
-        await self.database.products.create_index("current_price")
-        await self.database.products.create_index("average_rating")
+
+        # Collections and indexes are created once per schema version by schema.py
         
         print("Connected to MongoDB successfully")
     
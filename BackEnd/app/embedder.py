@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from database import mongodb
+
+COLLECTION = "embedding_cache"
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE") or 64)
+EMBED_BATCH_WAIT_MS = float(os.getenv("EMBED_BATCH_WAIT_MS") or 20)
+# Vectors are large (~1536 floats), so only a small hot set stays in process
+EMBED_MEMORY_CACHE_SIZE = int(os.getenv("EMBED_MEMORY_CACHE_SIZE") or 256)
+
+EmbedBatch = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+def embedding_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+
+
+class BatchingEmbedder:
+    """
+    Collects embedding requests into batch API calls, backed by a persistent cache.
+
+    Requests arriving within `max_wait_ms` of each other (or until `max_batch`
+    are pending) are flushed together: identical texts share one future, cached
+    vectors are read with a single `$in` query, and the remaining texts go to
+    the provider in one `embed_batch` call. Vectors are cached by a hash of the
+    model name and text, so they are only recomputed when the text changes.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatch,
+        model: str,
+        max_batch: int = EMBED_BATCH_SIZE,
+        max_wait_ms: float = EMBED_BATCH_WAIT_MS,
+        memory_size: int = EMBED_MEMORY_CACHE_SIZE,
+        collection=None,
+    ):
+        self.embed_batch = embed_batch
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.memory_size = memory_size
+        self._collection = collection
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._pending: Dict[str, str] = {}
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        self.stats = {"requests": 0, "memory_hits": 0, "store_hits": 0, "computed": 0, "batches": 0}
+
+    @property
+    def collection(self):
+        if self._collection is not None:
+            return self._collection
+        return mongodb.database[COLLECTION] if mongodb.database is not None else None
+
+    def _remember(self, key: str, vector: List[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    async def embed(self, text: str) -> List[float]:
+        self.stats["requests"] += 1
+        key = embedding_key(self.model, text)
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return vector
+
+        future = self._futures.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[key] = future
+            self._pending[key] = text
+            if len(self._pending) >= self.max_batch:
+                self._schedule_flush(0)
+            elif self._timer is None:
+                self._schedule_flush(self.max_wait)
+        return await asyncio.shield(future)
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def _schedule_flush(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(delay, self._start_flush)
+
+    def _start_flush(self):
+        self._timer = None
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _load_cached(self, keys: List[str]) -> Dict[str, List[float]]:
+        collection = self.collection
+        if collection is None:
+            return {}
+        try:
+            return {
+                doc["_id"]: doc["vector"]
+                async for doc in collection.find({"_id": {"$in": keys}}, {"vector": 1})
+            }
+        except Exception as e:
+            print(f"[Embedder] cache lookup failed: {e}")
+            return {}
+
+    async def _store(self, vectors: Dict[str, List[float]]):
+        collection = self.collection
+        if collection is None or not vectors:
+            return
+        now = datetime.utcnow()
+        try:
+            await collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": key},
+                        {"$set": {"vector": vector, "model": self.model, "created_at": now}},
+                        upsert=True,
+                    )
+                    for key, vector in vectors.items()
+                ],
+                ordered=False,
+            )
+        except Exception as e:
+            print(f"[Embedder] cache store failed: {e}")
+
+    async def flush(self):
+        """Resolve every pending request: cache lookups first, one provider call for the rest."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        futures = {key: self._futures.pop(key) for key in pending}
+        try:
+            found = await self._load_cached(list(pending))
+            self.stats["store_hits"] += len(found)
+            missing = [key for key in pending if key not in found]
+            if missing:
+                self.stats["batches"] += 1
+                computed = await self.embed_batch([pending[key] for key in missing])
+                fresh = dict(zip(missing, computed))
+                self.stats["computed"] += len(fresh)
+                found.update(fresh)
+                await self._store(fresh)
+            for key, future in futures.items():
+                self._remember(key, found[key])
+                if not future.done():
+                    future.set_result(found[key])
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Marked retrieved: callers that already went away must not log it
+                    future.exception()
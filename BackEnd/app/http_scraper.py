@@ -0,0 +1,92 @@
+from typing import Dict, Optional
+from urllib.parse import urljoin
+
+import httpx
+from bs4 import BeautifulSoup
+
+from scraperAbans import HpScraper
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+class BrowserRequired(Exception):
+    """The storefront did not serve usable HTML, so the page needs a real browser."""
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Process-wide pooled client for storefront requests."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+class HpHttpScraper:
+    """
+    Scrapes the server-rendered WooCommerce storefront with plain HTTP requests.
+
+    Search and product pages are fetched directly and parsed with HpScraper's
+    selectors. BrowserRequired is raised when a page comes back without the
+    markup those selectors expect (bot challenge, JS-only shell), so callers can
+    fall back to the Selenium scraper.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
+        self.base_url = (base_url or HpScraper.BASE_URL).rstrip("/")
+        self.client = client or get_http_client()
+
+    async def _get(self, url: str, params: Optional[dict] = None) -> httpx.Response:
+        response = await self.client.get(url, params=params)
+        if response.status_code in (403, 429, 503):
+            raise BrowserRequired(f"{url} answered {response.status_code}")
+        response.raise_for_status()
+        return response
+
+    async def find_product_url(self, model_name: str) -> Optional[str]:
+        response = await self._get(
+            f"{self.base_url}/", params={"s": model_name, "post_type": "product"}
+        )
+        soup = BeautifulSoup(response.text, "html.parser")
+
+        # WooCommerce redirects straight to the product when the search has one hit
+        if soup.select_one("h1.product_title"):
+            return str(response.url)
+
+        link = soup.select_one(HpScraper.PRODUCT_LINK_SELECTOR)
+        if link and link.get("href"):
+            return urljoin(str(response.url), link["href"])
+
+        if soup.select_one(".products, .woocommerce-info, .woocommerce-no-products-found"):
+            return None
+        raise BrowserRequired(f"search page for '{model_name}' has no storefront markup")
+
+    async def search_and_scrape(self, model_name: str, scheduler: bool) -> Optional[Dict]:
+        url = await self.find_product_url(model_name)
+        if url is None:
+            print("No products found for model:", model_name)
+            return None
+
+        print("Fetching:", url)
+        html = (await self._get(url)).text
+        if "product_title" not in html and "woocommerce-Price-amount" not in html:
+            raise BrowserRequired(f"product page {url} has no product markup")
+        if scheduler:
+            return HpScraper.parse_price_and_reviews(html)
+        return HpScraper.parse_product_page(html)
@@ -0,0 +1,368 @@
+import asyncio
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from browser_pool import browser_pool
+from categorizer import backfill_categories, categorize
+from database import mongodb
+from http_scraper import BrowserRequired, HpHttpScraper
+from llm_service import LLMService, get_llm_service
+from pdf_cache import CachedPdf, pdf_cache
+from pdf_parser import CANONICAL_PDFS, PARSE_WORKERS, brand_for_sku, parse_specs_async
+from pipeline import Stage, StagedPipeline
+from price_history import PriceObservation, price_history
+from product_writer import BatchResult, ProductWriter
+from scraperAbans import LenovoScraper, HpScraper
+
+
+class IngestionTracker:
+    """Tracks a background catalog job (ingestion or price refresh) and per-SKU progress."""
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.status = "idle"
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.completed_runs = 0
+        self.error: Optional[str] = None
+        self.skus: Dict[str, dict] = {}
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self, job: Callable[[], Awaitable[None]]) -> Optional[asyncio.Task]:
+        """Schedule `job` as a background task unless a run is already in flight."""
+        if self.running:
+            return None
+        self.task = asyncio.create_task(self._run(job))
+        return self.task
+
+    async def _run(self, job: Callable[[], Awaitable[None]]):
+        self.status = "running"
+        self.started_at = datetime.utcnow()
+        self.finished_at = None
+        self.error = None
+        self.skus = {}
+        try:
+            await job()
+            self.status = "completed"
+            self.completed_runs += 1
+        except asyncio.CancelledError:
+            self.status = "cancelled"
+            raise
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            print(f"Ingestion run failed: {e}")
+        finally:
+            self.finished_at = datetime.utcnow()
+
+    async def stop(self):
+        if self.running:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    def mark(self, sku: str, stage: str, error: Optional[str] = None):
+        """Record the current stage of a SKU within the active run."""
+        entry = {"stage": stage, "updated_at": datetime.utcnow().isoformat()}
+        if error:
+            entry["error"] = error
+        self.skus[sku] = entry
+
+    def snapshot(self) -> dict:
+        return {
+            "status": self.status,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "completed_runs": self.completed_runs,
+            "error": self.error,
+            "skus": dict(self.skus),
+        }
+
+
+ingestion_tracker = IngestionTracker()
+refresh_tracker = IngestionTracker()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+DOWNLOAD_CONCURRENCY = _env_int("INGEST_DOWNLOAD_CONCURRENCY", 4)
+PARSE_CONCURRENCY = _env_int("INGEST_PARSE_CONCURRENCY", PARSE_WORKERS)
+SCRAPE_CONCURRENCY = _env_int("INGEST_SCRAPE_CONCURRENCY", browser_pool.max_size)
+# Concurrent embeds are coalesced into batch calls by the embedder, so this can run wide
+EMBED_CONCURRENCY = _env_int("INGEST_EMBED_CONCURRENCY", 16)
+PERSIST_CONCURRENCY = _env_int("INGEST_PERSIST_CONCURRENCY", 2)
+STAGE_QUEUE_SIZE = _env_int("INGEST_QUEUE_SIZE", 16)
+HTTP_SCRAPING = os.getenv("SCRAPE_HTTP_FIRST", "1") != "0"
+
+
+@dataclass
+class SkuJob:
+    """A SKU travelling through the ingestion pipeline."""
+
+    sku: str
+    pdf_url: str
+    scheduler: bool = False
+    pdf: Optional[CachedPdf] = None
+    product_data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def brand(self) -> str:
+        return brand_for_sku(self.sku)
+
+
+def record_batch(tracker: IngestionTracker, batch: Optional[BatchResult], stage: str = "done"):
+    """Mark the SKUs of a flushed write batch as stored or failed."""
+    if batch is None:
+        return
+    failed = set(batch.failed_skus)
+    for sku in batch.skus:
+        if sku in failed:
+            tracker.mark(sku, "failed", error=batch.error or "write failed")
+        else:
+            tracker.mark(sku, stage)
+
+
+def _clean_review_count(raw) -> int:
+    digits = re.sub(r"[^\d]", "", str(raw or ""))
+    return int(digits) if digits else 0
+
+
+def _clean_price(raw) -> Optional[float]:
+    if raw is None or isinstance(raw, (int, float)):
+        return raw
+    return HpScraper.clean_price(str(raw))
+
+
+def live_fields(scraped: Optional[dict]) -> Dict[str, Any]:
+    """Normalized marketplace fields present in a (full or light) scrape result."""
+    if not scraped:
+        return {}
+    fields = {
+        "current_price": _clean_price(scraped.get("price")),
+        "availability": scraped.get("in_stock"),
+        "review_count": (
+            _clean_review_count(scraped["review_count"])
+            if scraped.get("review_count") is not None
+            else None
+        ),
+        "average_rating": (
+            float(scraped["rating"]) if scraped.get("rating") is not None else None
+        ),
+    }
+    return {key: value for key, value in fields.items() if value is not None}
+
+
+def apply_scraped(product_data: dict, scraped: Optional[dict]):
+    """Merge live marketplace fields from a scrape result into the product."""
+    if not scraped:
+        return
+    product_data.update(live_fields(scraped))
+    product_data["specs_live"] = scraped.get("specs")
+
+
+async def scrape_live(sku: str, brand: str, scheduler: bool = False) -> Optional[dict]:
+    """Scrape marketplace data, trying plain HTTP first where the storefront allows it."""
+    if brand == "hp" and HTTP_SCRAPING:
+        try:
+            return await HpHttpScraper().search_and_scrape(sku, scheduler=scheduler)
+        except (BrowserRequired, httpx.HTTPError) as e:
+            print(f"HTTP scrape failed for {sku}, falling back to browser: {e}")
+
+    scraper_cls = LenovoScraper if brand == "lenovo" else HpScraper
+    return await browser_pool.run(
+        lambda driver: scraper_cls(driver).search_and_scrape(sku, scheduler=scheduler)
+    )
+
+
+async def embed_product(product_data: dict, llm_service: LLMService):
+    text_to_embed = (
+        f"{product_data['canonical_name']} {product_data['technical_specs']}"
+    )
+    product_data["embedding"] = await llm_service.get_embedding(text_to_embed)
+
+
+async def initialize_canonical_data(scheduler: bool = False):
+    """
+    Initialize database with canonical PDF specs and scrape live data.
+
+    SKUs flow through download -> parse -> scrape -> embed -> persist stages that
+    run concurrently, each bounded by its own INGEST_*_CONCURRENCY setting.
+    """
+    llm_service = get_llm_service()
+    writer = ProductWriter()
+
+    async def download(job: SkuJob) -> SkuJob:
+        ingestion_tracker.mark(job.sku, "downloading")
+        job.pdf = await asyncio.to_thread(pdf_cache.fetch, job.pdf_url)
+        return job
+
+    async def parse(job: SkuJob) -> SkuJob:
+        ingestion_tracker.mark(job.sku, "parsing")
+        specs = await parse_specs_async(job.pdf, job.brand)
+        job.product_data = {
+            "brand": job.brand,
+            "model": job.sku,
+            "sku": job.sku,
+            "canonical_name": job.sku.replace("_", " ").title(),
+            "technical_specs": specs,
+            "current_price": 0.0,
+            "currency": "USD",
+            "availability": "out_of_stock",
+            "review_count": 0,
+            "average_rating": 0.0,
+            "source_urls": [job.pdf_url],
+        }
+        return job
+
+    async def scrape(job: SkuJob) -> SkuJob:
+        ingestion_tracker.mark(job.sku, "scraping")
+        print(f"Scraping live data for {job.sku}...")
+        scraped = await scrape_live(job.sku, job.brand, scheduler=job.scheduler)
+        print(f"Scraped live data for {job.sku}: {scraped}")
+        apply_scraped(job.product_data, scraped)
+        return job
+
+    async def embed(job: SkuJob) -> SkuJob:
+        ingestion_tracker.mark(job.sku, "embedding")
+        job.product_data.update(await categorize(job.product_data, llm_service))
+        await embed_product(job.product_data, llm_service)
+        return job
+
+    async def persist(job: SkuJob) -> SkuJob:
+        ingestion_tracker.mark(job.sku, "saving")
+        record_batch(ingestion_tracker, await writer.upsert(job.product_data))
+        return job
+
+    def on_error(job: SkuJob, stage: str, error: Exception):
+        print(f"Failed to initialize {job.sku} during {stage}: {error}")
+        ingestion_tracker.mark(job.sku, "failed", error=f"{stage}: {error}")
+
+    existing = {
+        doc["sku"]
+        async for doc in mongodb.database.products.find(
+            {"sku": {"$in": list(CANONICAL_PDFS)}}, {"sku": 1}
+        )
+    }
+    jobs = []
+    for product_key, pdf_url in CANONICAL_PDFS.items():
+        if product_key in existing:
+            ingestion_tracker.mark(product_key, "skipped")
+            continue
+        ingestion_tracker.mark(product_key, "pending")
+        jobs.append(SkuJob(sku=product_key, pdf_url=pdf_url, scheduler=scheduler))
+
+    pipeline = StagedPipeline(
+        [
+            Stage("download", download, DOWNLOAD_CONCURRENCY, STAGE_QUEUE_SIZE),
+            Stage("parse", parse, PARSE_CONCURRENCY, STAGE_QUEUE_SIZE),
+            Stage("scrape", scrape, SCRAPE_CONCURRENCY, STAGE_QUEUE_SIZE),
+            Stage("embed", embed, EMBED_CONCURRENCY, STAGE_QUEUE_SIZE),
+            Stage("persist", persist, PERSIST_CONCURRENCY, STAGE_QUEUE_SIZE),
+        ],
+        on_error=on_error,
+    )
+    try:
+        done = await pipeline.run(jobs)
+        record_batch(ingestion_tracker, await writer.flush())
+        # Catalog entries from before categorization (or an older rules version); runs after
+        # the flush so products categorized above are not picked up again
+        await backfill_categories(mongodb.database, writer, llm_service)
+        await writer.flush()
+        await price_history.record(
+            [
+                PriceObservation(
+                    sku=job.sku,
+                    price=job.product_data["current_price"],
+                    currency=job.product_data.get("currency", "USD"),
+                )
+                for job in done
+                if job.product_data.get("current_price")
+                and job.sku not in writer.totals.failed_skus
+            ]
+        )
+        stored = len(done) - len(writer.totals.failed_skus)
+        print(f"Ingestion finished: {stored}/{len(jobs)} SKUs stored.")
+    finally:
+        await browser_pool.release_idle()
+
+
+async def refresh_live_data():
+    """
+    Refresh price, stock and rating of products already in the catalog.
+
+    Uses the light scrape path, writes only the fields that changed through
+    batched bulk writes, and records every scraped price in the price-history
+    store whether or not it moved.
+    """
+    products = await mongodb.database.products.find(
+        {},
+        {
+            "sku": 1,
+            "brand": 1,
+            "currency": 1,
+            "current_price": 1,
+            "availability": 1,
+            "review_count": 1,
+            "average_rating": 1,
+        },
+    ).to_list(length=None)
+    slots = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    writer = ProductWriter()
+    observations = []
+
+    async def refresh(product: dict):
+        sku = product["sku"]
+        refresh_tracker.mark(sku, "scraping")
+        try:
+            async with slots:
+                scraped = await scrape_live(sku, product.get("brand") or brand_for_sku(sku), scheduler=True)
+            # Inside the try: a malformed price or rating must only fail this SKU, not the whole run
+            fields = live_fields(scraped)
+        except Exception as e:
+            print(f"Failed to refresh {sku}: {e}")
+            refresh_tracker.mark(sku, "failed", error=str(e))
+            return
+
+        if fields.get("current_price"):
+            observations.append(
+                PriceObservation(
+                    sku=sku,
+                    price=fields["current_price"],
+                    currency=product.get("currency", "USD"),
+                    promo_applied=bool(scraped.get("discount")),
+                )
+            )
+        changes = {key: value for key, value in fields.items() if product.get(key) != value}
+        if not changes:
+            refresh_tracker.mark(sku, "unchanged")
+            return
+
+        update = {"$set": {**changes, "last_updated": datetime.utcnow()}}
+        refresh_tracker.mark(sku, "saving")
+        record_batch(refresh_tracker, await writer.update(sku, update), stage="updated")
+
+    try:
+        await asyncio.gather(*(refresh(p) for p in products))
+        record_batch(refresh_tracker, await writer.flush(), stage="updated")
+        recorded = await price_history.record(observations)
+        print(
+            f"Refreshed {writer.totals.modified}/{len(products)} products, "
+            f"recorded {recorded} price observations."
+        )
+    finally:
+        await browser_pool.release_idle()
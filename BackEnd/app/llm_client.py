@@ -0,0 +1,126 @@
+import asyncio
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+import openai
+
+T = TypeVar("T")
+
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY") or 16)
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS") or 30)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES") or 2)
+LLM_BACKOFF_SECONDS = float(os.getenv("LLM_BACKOFF_SECONDS") or 0.5)
+
+# Transient provider failures worth another attempt; anything else fails fast
+RETRYABLE_ERRORS: Tuple[Type[BaseException], ...] = (
+    asyncio.TimeoutError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class OperationStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.in_flight = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+
+    def snapshot(self) -> dict:
+        completed = self.calls - self.in_flight
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "in_flight": self.in_flight,
+            "avg_latency_ms": round(self.total_latency_ms / completed, 1) if completed else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 1),
+        }
+
+
+class LLMClient:
+    """
+    Shared gate for outbound LLM calls.
+
+    Every call runs under a process-wide concurrency limit, gets a per-attempt
+    deadline and is retried on transient errors with full-jitter exponential
+    backoff. Latency and error counters are kept per operation name.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = LLM_CONCURRENCY,
+        timeout: float = LLM_TIMEOUT_SECONDS,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff: float = LLM_BACKOFF_SECONDS,
+    ):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.stats: Dict[str, OperationStats] = {}
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        return self._slots
+
+    def _delay(self, attempt: int) -> float:
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    async def call(
+        self,
+        operation: str,
+        request: Callable[[], Awaitable[T]],
+        timeout: Optional[float] = None,
+    ) -> T:
+        """Await `request()` (a fresh awaitable per attempt) under the limit, deadline and retry policy."""
+        stats = self.stats.setdefault(operation, OperationStats())
+        stats.calls += 1
+        stats.in_flight += 1
+        started = time.perf_counter()
+        try:
+            attempt = 0
+            while True:
+                try:
+                    async with self.slots:
+                        return await asyncio.wait_for(request(), timeout or self.timeout)
+                except RETRYABLE_ERRORS as e:
+                    if isinstance(e, asyncio.TimeoutError):
+                        stats.timeouts += 1
+                    if attempt >= self.max_retries:
+                        raise
+                    stats.retries += 1
+                    delay = self._delay(attempt)
+                    print(f"[LLM] {operation} attempt {attempt + 1} failed ({type(e).__name__}), retrying in {delay:.2f}s")
+                    attempt += 1
+                    await asyncio.sleep(delay)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            latency_ms = (time.perf_counter() - started) * 1000
+            stats.total_latency_ms += latency_ms
+            stats.max_latency_ms = max(stats.max_latency_ms, latency_ms)
+
+    def snapshot(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "timeout_seconds": self.timeout,
+            "max_retries": self.max_retries,
+            "operations": {name: stats.snapshot() for name, stats in self.stats.items()},
+        }
+
+
+llm_client = LLMClient()
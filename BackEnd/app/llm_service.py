@@ -7,6 +7,8 @@ from google.adk.models.lite_llm import LiteLlm
 from google.adk.runners import Runner
 from tools.search_products_tools import search_products_tool
 from langchain.output_parsers import PydanticOutputParser
+from llm_client import LLM_TIMEOUT_SECONDS, llm_client
+from embedder import BatchingEmbedder
 
 load_dotenv()
 from typing import List, Optional
@@ -58,6 +60,9 @@ Narrow:
 
 
 class LLMService:
+    # Bump whenever the summarize_text prompt changes; cached summaries are keyed on it
+    SUMMARY_PROMPT_VERSION = 3
+
     def __init__(self):
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
@@ -66,22 +71,36 @@ class LLMService:
         chat_model = os.getenv("OPENAI_CHAT_MODEL", "gpt-4.1-nano")
         embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
 
+        # Retries and deadlines are owned by llm_client, so the SDK clients don't retry on their own
         self.llm = ChatOpenAI(
             model_name=chat_model,
             temperature=0.3,
             openai_api_key=api_key,
+            request_timeout=LLM_TIMEOUT_SECONDS,
+            max_retries=0,
         )
         self.embedding_model = OpenAIEmbeddings(
             model=embedding_model,
             openai_api_key=api_key,
+            request_timeout=LLM_TIMEOUT_SECONDS,
+            max_retries=0,
         )
         self._api_key = api_key
         self._chat_model = chat_model
+        self.embedder = BatchingEmbedder(self.embed_documents, embedding_model)
+
+    @property
+    def chat_model(self) -> str:
+        return self._chat_model
 
     async def get_embedding(self, text: str) -> List[float]:
-        """Generate vector embeddings for given text."""
-        # langchain embeddings return a list directly
-        return await self.embedding_model.aembed_query(text)
+        """Generate vector embeddings for given text (batched and cached by the embedder)."""
+        return await self.embedder.embed(text)
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """One provider call for a batch of texts."""
+        # langchain embeddings return lists directly
+        return await llm_client.call("embedding", lambda: self.embedding_model.aembed_documents(texts))
 
     async def summarize_text(self, text: str, max_tokens: int = 200) -> str:
         """
@@ -95,26 +114,56 @@ class LLMService:
         """
 
         prompt = f"""
-        
         context: {text}
         Instructions
-        Usually a laptop can be categorized as their intended purpose as bellow
-        1. General/Everyday Laptop - Uses for basic computing tasks (web browsing, email, word processing, video streaming, and light multitasking). features a mid-range processor (e.g., Intel Core i3/i5 or equivalent AMD Ryzen), 8GB, and SSD storage.
-        2. Office/Business Laptops - Professional work, presentations, data management, and secure remote access. Prioritizes reliability, robust security features (e.g., fingerprint readers, TPM chips), durable build quality, and often long battery life. features a mid-range to high-end processor (e.g., Intel Core i5/i7 or equivalent AMD Ryzen), 8GB or 16GB, and SSD storage.
-        3. Gaming Laptops - Performance for gaming is the focus. Built for the latest, most graphically intensive titles. features a high-end processor (e.g., Intel Core i5/i7 or equivalent AMD Ryzen), 16GB or more ram, dedicated GPU (eg. GeForce RTX 3050 Laptop GPU, AMD Radeon RX 7000M Laptop GPU) and NvMe or SSD storage.
+        Each line of the context is one laptop; its `category` (general, business or gaming) was assigned from its specs; place any laptop without one by its specs.
 
         Steps:
-        1. Identify  the context given
-        2. use the information in instruction to identify correct category/categories of the laptop
-        3. provide a summarize based on the category and the context provided
+        1. Group the laptops by category
+        2. provide a summarize based on the category and the context provided
 
         """
         print(f"prompt is {prompt}")
-        response = self.llm.invoke(prompt)
+        response = await llm_client.call("summarize", lambda: self.llm.ainvoke(prompt))
 
         summary = response.content
         return summary
 
+    async def classify_laptop(self, text: str) -> str:
+        """
+        Ask which intended-use category a laptop belongs to.
+
+        Only used by the categorizer when its rules can't decide; the answer is
+        stored on the product, so this runs at most once per product.
+        """
+        prompt = f"""
+        context: {text}
+        Usually a laptop can be categorized as their intended purpose as bellow
+        1. General/Everyday Laptop - Uses for basic computing tasks (web browsing, email, word processing, video streaming, and light multitasking). features a mid-range processor (e.g., Intel Core i3/i5 or equivalent AMD Ryzen), 8GB, and SSD storage.
+        2. Office/Business Laptops - Professional work, presentations, data management, and secure remote access. Prioritizes reliability, robust security features (e.g., fingerprint readers, TPM chips), durable build quality, and often long battery life. features a mid-range to high-end processor (e.g., Intel Core i5/i7 or equivalent AMD Ryzen), 8GB or 16GB, and SSD storage.
+        3. Gaming Laptops - Performance for gaming is the focus. Built for the latest, most graphically intensive titles. features a high-end processor (e.g., Intel Core i5/i7 or equivalent AMD Ryzen), 16GB or more ram, dedicated GPU (eg. GeForce RTX 3050 Laptop GPU, AMD Radeon RX 7000M Laptop GPU) and NvMe or SSD storage.
+
+        Answer with exactly one word: general, business or gaming.
+        """
+        response = await llm_client.call("classify", lambda: self.llm.ainvoke(prompt))
+        return response.content
+
+    async def aclose(self):
+        """Close the pooled HTTP clients behind the chat and embedding models."""
+        for model in (self.llm, self.embedding_model):
+            for attr in ("async_client", "client"):
+                # langchain keeps the OpenAI resource; its `_client` owns the connection pool
+                owner = getattr(getattr(model, attr, None), "_client", None)
+                close = getattr(owner, "close", None)
+                if close is None:
+                    continue
+                try:
+                    result = close()
+                    if hasattr(result, "__await__"):
+                        await result
+                except Exception as e:
+                    print(f"Failed to close LLM client: {e}")
+
     def create_base_agent(self, app_name: str, session_service):
         """Create the base LLM agent wrapped in a Runner."""
         try:
@@ -149,3 +198,21 @@ class LLMService:
         except Exception as e:
             print(f"Error creating base agent: {e}")
             return None
+
+
+_llm_service: Optional[LLMService] = None
+
+
+def get_llm_service() -> LLMService:
+    """Process-wide LLMService; its model clients and connection pools are shared by all requests."""
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService()
+    return _llm_service
+
+
+async def close_llm_service():
+    global _llm_service
+    if _llm_service is not None:
+        await _llm_service.aclose()
+        _llm_service = None
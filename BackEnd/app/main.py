@@ -1,25 +1,55 @@
-import json
 import os
-import re
+import time
+from contextlib import aclosing
 import uuid
-from fastapi import Body, FastAPI, HTTPException, Query, Depends
+from fastapi import Body, FastAPI, HTTPException, Query, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
+from typing import List, Optional, Union
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from fastapi.responses import JSONResponse
-from services import MongoSessionService
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from services import get_session_service
+from runner_registry import runner_registry
 from pydantic import BaseModel
-from llm_service import LLMService
-from pdf_parser import CANONICAL_PDFS, PDFParser
-from utils import call_agent_async, add_user_query_to_history
+from llm_service import close_llm_service, get_llm_service
+from ingestion import (
+    ingestion_tracker,
+    initialize_canonical_data,
+    refresh_live_data,
+    refresh_tracker,
+)
+from pdf_parser import shutdown_parse_pool
+from browser_pool import browser_pool
+from http_scraper import close_http_client
+from utils import call_agent_async, add_user_query_to_history, format_sse, stream_agent_events
 import asyncio
 
 # from llm_service import LLMService
-from models import Product, RecommendationRequest, Brand
+from models import (
+    Product,
+    RecommendationRequest,
+    Brand,
+    LaptopCategory,
+    PriceHistorySeries,
+    PriceInterval,
+    ProductPage,
+    ProductSort,
+    ProductSummary,
+    ProductView,
+    SearchMode,
+)
+from pagination import MAX_PAGE_SIZE, SORTS, InvalidCursor, decode_cursor, encode_cursor, keyset_filter, sort_spec
+from product_views import build_projection
+from price_history import as_utc, price_history
+from schema import bootstrap_schema
+from product_writer import add_product_listener
+from vector_index import vector_index
+from text_index import text_index
+from summary_cache import summary_cache
+from llm_client import llm_client
+from prompt_serializer import prompt_stats
+import product_search
+from datetime import datetime, timedelta
 from database import mongodb
-from scraperAbans import LenovoScraper, HpScraper
-from google.genai.types import Content, Part
-from llm_service import LLMService
 
 app = FastAPI(
     title="Laptop Intelligence API",
@@ -53,154 +83,145 @@ app.add_middleware(
 )
 
 
-def get_llm_service():
-    return LLMService()
+scheduler = AsyncIOScheduler()
 
+APP_NAME = "LaptopIntelligence"
+# Duration of each startup step in milliseconds, reported by /metrics
+startup_metrics = {}
+# Background load of the in-memory search indexes, reported by /ready
+search_index_status = {"status": "pending", "error": None}
+search_index_task: Optional[asyncio.Task] = None
 
-scheduler = AsyncIOScheduler()
+
+PRICE_REFRESH_MINUTES = int(os.getenv("PRICE_REFRESH_MINUTES") or 60)
 
 
 @scheduler.scheduled_job("interval", hours=12)
 async def scheduled_scrape():
-    print("⏳ Running scheduled Lenovo scrape...")
-    try:
-        await initialize_canonical_data(scheduler=True)
+    print("⏳ Running scheduled catalog ingestion...")
+    task = ingestion_tracker.start(initialize_canonical_data)
+    if task is None:
+        print(" Skipping scheduled scrape: an ingestion run is already in progress.")
+        return
+    await task
+    if ingestion_tracker.status == "completed":
         print(" Scrape completed successfully.")
-    except Exception as e:
-        print(f" Scrape failed: {e}")
+    else:
+        print(f" Scrape failed: {ingestion_tracker.error}")
 
 
-async def initialize_canonical_data(scheduler: bool = False):
-    """Initialize database with canonical PDF specs and scrape live data"""
-    pdf_parser = PDFParser()
-    scraper = None
+@scheduler.scheduled_job("interval", minutes=PRICE_REFRESH_MINUTES)
+async def scheduled_refresh():
+    print("⏳ Refreshing live prices...")
+    task = refresh_tracker.start(refresh_live_data)
+    if task is None:
+        print(" Skipping price refresh: the previous refresh is still running.")
+        return
+    await task
+    if refresh_tracker.status != "completed":
+        print(f" Price refresh failed: {refresh_tracker.error}")
 
-    try:
 
-        scraper = LenovoScraper()
-        scraperHp = HpScraper()
-        scraper.setup_driver()
-
-        for product_key, pdf_url in CANONICAL_PDFS.items():
-
-            existing = await mongodb.database.products.find_one({"sku": product_key})
-            if existing:
-                continue
-
-            try:
-
-                pdf_content = pdf_parser.download_pdf(pdf_url)
-                if "lenovo" in product_key:
-                    specs = pdf_parser.parse_lenovo_specs(pdf_content)
-                else:
-                    specs = pdf_parser.parse_hp_specs(pdf_content)
-
-                product_data = {
-                    "brand": "lenovo" if "lenovo" in product_key else "hp",
-                    "model": product_key,
-                    "sku": product_key,
-                    "canonical_name": product_key.replace("_", " ").title(),
-                    "technical_specs": specs,
-                    "current_price": 0.0,
-                    "currency": "USD",
-                    "availability": "out_of_stock",
-                    "review_count": 0,
-                    "average_rating": 0.0,
-                    "source_urls": [pdf_url],
-                }
-
-                if "lenovo" in product_key:
-                    print(f"Scraping live data for {product_key}...")
-                    scraped = scraper.search_and_scrape(
-                        product_key, scheduler=scheduler
-                    )
-                    print(f"Scraped data: {scraped}")
-                    review_count_raw = scraped.get("review_count", "0")
-                    review_count_clean = int(re.sub(r"[^\d]", "", review_count_raw))
-
-                    if scraped:
-                        product_data.update(
-                            {
-                                "current_price": scraped.get("price") or 0.0,
-                                "availability": scraped.get("in_stock"),
-                                "review_count": review_count_clean,
-                                "average_rating": float(scraped.get("rating") or 0.0),
-                                "specs_live": scraped.get("specs"),
-                            }
-                        )
-                        print(f"Scraped live data for {product_key}: {scraped}")
-                else:
-                    print(f"Scraping live data for {product_key}...")
-                    scraped = scraperHp.search_and_scrape(
-                        product_key, scheduler=scheduler
-                    )
-                    print(f"Scraped data: {scraped}")
-                    review_count_raw = scraped.get("review_count", "0")
-                    review_count_clean = int(re.sub(r"[^\d]", "", review_count_raw))
-
-                    if scraped:
-                        product_data.update(
-                            {
-                                "current_price": scraped.get("price") or 0.0,
-                                "availability": scraped.get("in_stock"),
-                                "review_count": review_count_clean,
-                                "average_rating": float(scraped.get("rating") or 0.0),
-                                "specs_live": scraped.get("specs"),
-                            }
-                        )
-                        print(f"Scraped live data for {product_key}: {scraped}")
-
-                llm_service = get_llm_service()
-                await save_product_with_embedding(product_data, llm_service)
-
-                await mongodb.database.products.insert_one(product_data)
-
-            except Exception as e:
-                print(f"Failed to initialize {product_key}: {e}")
+@scheduler.scheduled_job("cron", hour=3)
+async def scheduled_price_history_compaction():
+    await price_history.compact()
+
 
+async def load_search_indexes():
+    started = time.perf_counter()
+    search_index_status.update(status="loading", error=None)
+    try:
+        await asyncio.gather(vector_index.load(), text_index.load())
+        search_index_status["status"] = "ready"
+    except Exception as e:
+        search_index_status.update(status="failed", error=str(e))
+        print(f"Search index load failed, search stays on the unranked fallback: {e}")
     finally:
-        if scraper:
-            scraper.close_driver()
+        startup_metrics["search_indexes"] = round((time.perf_counter() - started) * 1000, 1)
 
 
 @app.on_event("startup")
 async def startup_event():
+    started = time.perf_counter()
+
+    def record(step: str, since: float) -> float:
+        now = time.perf_counter()
+        startup_metrics[step] = round((now - since) * 1000, 1)
+        return now
+
     await mongodb.connect()
-    # Initialize with canonical data
-    await initialize_canonical_data()
+    await bootstrap_schema()
+    step = record("database", started)
+    add_product_listener(vector_index.apply_write)
+    add_product_listener(text_index.apply_write)
+    add_product_listener(summary_cache.apply_write)
+    # Loading grows with the catalog, so it runs in the background; search falls back until then
+    global search_index_task
+    search_index_task = asyncio.create_task(load_search_indexes())
+    try:
+        get_llm_service()
+        runner_registry.warm_up(APP_NAME)
+    except ValueError as e:
+        print(f"LLM service unavailable, search and chat will fail until configured: {e}")
+    record("runner_warm_up", step)
+    record("total", started)
+    # Ingest canonical data in the background; the API serves the existing catalog meanwhile
+    ingestion_tracker.start(initialize_canonical_data)
     scheduler.start()
-    print("Scheduler started. Canonical data will be refreshed every 12 hours.")
+    print(
+        "Scheduler started. New catalog SKUs are ingested every 12 hours and "
+        f"live prices refreshed every {PRICE_REFRESH_MINUTES} minutes."
+    )
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    scheduler.shutdown(wait=False)
+    if search_index_task is not None:
+        search_index_task.cancel()
+    await ingestion_tracker.stop()
+    await refresh_tracker.stop()
+    shutdown_parse_pool()
+    await browser_pool.close()
+    await close_http_client()
+    await close_llm_service()
     await mongodb.disconnect()
 
 
-async def save_product_with_embedding(product_data: dict, llm_service: LLMService):
-    text_to_embed = (
-        f"{product_data['canonical_name']} {product_data['technical_specs']}"
-    )
-    embedding = await llm_service.get_embedding(text_to_embed)
-    product_data["embedding"] = embedding
-    await mongodb.database.products.insert_one(product_data)
-
-
 @app.get("/")
 async def root():
     return {"message": "Laptop Intelligence API v1.0"}
 
 
-@app.get("/products", response_model=List[Product])
+@app.get(
+    "/products",
+    response_model=Union[ProductPage, List[ProductSummary]],
+    response_model_exclude_unset=True,
+)
 async def get_products(
+    response: Response,
     brand: Optional[Brand] = None,
+    category: Optional[LaptopCategory] = None,
     min_price: Optional[str] = None,
     max_price: Optional[str] = None,
     min_rating: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 50,
+    sort: Optional[ProductSort] = None,
+    cursor: Optional[str] = None,
+    view: ProductView = ProductView.SUMMARY,
+    fields: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
 ):
-    """Get products with filtering and pagination"""
+    """
+    Get products with filtering and pagination.
+
+    Passing `cursor` (empty for the first page) switches to keyset pagination and
+    returns {items, next_cursor}; without it the legacy skip/limit list is returned.
+    The next cursor is also sent in the X-Next-Cursor header.
+
+    Items use the summary view unless `view=full` or a comma-separated `fields=`
+    list is given; `embedding` is only returned when named in `fields`.
+    """
     query = {}
 
     # Safe conversions
@@ -220,6 +241,8 @@ async def get_products(
 
     if brand:
         query["brand"] = brand
+    if category:
+        query["category"] = category
     if min_price is not None or max_price is not None:
         query["current_price"] = {}
         if min_price is not None:
@@ -229,75 +252,184 @@ async def get_products(
     if min_rating is not None:
         query["average_rating"] = {"$gte": min_rating}
 
-    data = mongodb.database.products.find(query).skip(skip).limit(limit)
-    products = await data.to_list(length=limit)
-    return products
-
+    sort_name = sort.value if sort else "id"
+    try:
+        projection = build_projection(view, fields, required=[SORTS[sort_name][0]])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if cursor is None:
+        data = mongodb.database.products.find(query, projection)
+        if sort:
+            data = data.sort(sort_spec(sort_name))
+        products = await data.skip(skip).limit(limit).to_list(length=limit)
+        # Unsorted pages come back in natural order, which a keyset cursor can't continue
+        if sort and len(products) == limit:
+            response.headers["X-Next-Cursor"] = encode_cursor(sort_name, products[-1])
+        return products
 
-@app.get("/products/{product_id}", response_model=Product)
-async def get_product(product_id: str):
-    """Get specific product by ID"""
-    product = await mongodb.database.products.find_one({"_id": product_id})
+    try:
+        position = decode_cursor(cursor, sort_name)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    after = keyset_filter(sort_name, position)
+    if after:
+        query = {"$and": [query, after]} if query else after
+
+    # One extra document tells whether another page exists
+    data = (
+        mongodb.database.products.find(query, projection)
+        .sort(sort_spec(sort_name))
+        .limit(limit + 1)
+    )
+    products = await data.to_list(length=limit + 1)
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = encode_cursor(sort_name, products[-1])
+        response.headers["X-Next-Cursor"] = next_cursor
+    return {"items": products, "next_cursor": next_cursor}
+
+
+@app.get(
+    "/products/{product_id}",
+    response_model=ProductSummary,
+    response_model_exclude_unset=True,
+)
+async def get_product(
+    product_id: str,
+    view: ProductView = ProductView.FULL,
+    fields: Optional[str] = None,
+):
+    """Get specific product by ID (full view without the embedding unless `fields=` says otherwise)"""
+    try:
+        projection = build_projection(view, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    product = await mongodb.database.products.find_one({"_id": product_id}, projection)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
 
+@app.get("/products/{product_id}/price-history", response_model=PriceHistorySeries)
+async def get_price_history(
+    product_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    interval: PriceInterval = PriceInterval.DAY,
+):
+    """Downsampled price series (min/max/last per interval); defaults to the last 90 days"""
+    product = await mongodb.database.products.find_one(
+        {"$or": [{"_id": product_id}, {"sku": product_id}]}, {"sku": 1, "currency": 1}
+    )
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    end = as_utc(end) if end else datetime.utcnow()
+    start = as_utc(start) if start else end - timedelta(days=90)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    points = await price_history.series(product["sku"], start, end, interval.value)
+    return {
+        "sku": product["sku"],
+        "currency": product.get("currency", "USD"),
+        "interval": interval,
+        "start": start,
+        "end": end,
+        "points": points,
+    }
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "database": "connected"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """In-process counters for LLM calls, caches and scraping resources."""
+    try:
+        embedder = dict(get_llm_service().embedder.stats)
+    except ValueError:
+        embedder = None
+    return {
+        "llm": llm_client.snapshot(),
+        "embedder": embedder,
+        "summary_cache": summary_cache.stats(),
+        "prompt": prompt_stats,
+        "browser_pool": browser_pool.stats(),
+        "vector_index": {"products": len(vector_index)},
+        "text_index": {"products": len(text_index)},
+        "agent_runners": runner_registry.stats(),
+        "startup_ms": startup_metrics,
+    }
+
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Ready once MongoDB answers and there is a catalog to serve.
+
+    Search index loading is reported but does not gate readiness, since search
+    works (unranked) until the indexes are in memory.
+    """
+    try:
+        await mongodb.database.command("ping")
+        product_count = await mongodb.database.products.estimated_document_count()
+    except Exception as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "database": f"error: {e}"},
+        )
+
+    ready = product_count > 0 or ingestion_tracker.completed_runs > 0
+    body = {
+        "status": "ready" if ready else "starting",
+        "database": "connected",
+        "product_count": product_count,
+        "ingestion": ingestion_tracker.snapshot(),
+        "price_refresh": refresh_tracker.snapshot(),
+        "search_indexes": dict(
+            search_index_status,
+            vector_products=len(vector_index),
+            text_products=len(text_index),
+        ),
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+
 class SearchRequest(BaseModel):
     query: str
     limit: Optional[int] = 10
     min_price: Optional[float] = None
     max_price: Optional[float] = None
+    brand: Optional[Brand] = None
+    mode: SearchMode = SearchMode.HYBRID
 
 
 @app.get("/search")
 async def search_products(request: SearchRequest):
     """
-    Search products using MongoDB Atlas Search index and optional price filtering.
+    Product search ranked by BM25 keywords, embedding similarity or both
+    (`mode`), with optional price and brand filtering, summarized by the LLM.
     Excludes _id and embedding fields from results.
     """
-    pipeline = [
-        # {
-        #     "$search": {
-        #         "index": "default",
-        #         "text": {"query": request.query, "path": {"wildcard": "*"}},
-        #     }
-        # }
-    ]
     llm_service = get_llm_service()
-
-    price_filter = {}
-    if request.min_price is not None:
-        price_filter["$gte"] = request.min_price
-    if request.max_price is not None:
-        price_filter["$lte"] = request.max_price
-    if price_filter:
-        pipeline.append({"$match": {"current_price": price_filter}})
-
-    pipeline.append({"$project": {"_id": 0, "embedding": 0}})
-
-    pipeline.append({"$limit": request.limit or 10})
-
-    data = mongodb.database.products.aggregate(pipeline)
-    print("curser", data)
-    results = await data.to_list(length=request.limit or 10)
+    results = await product_search.search_products(
+        request.query,
+        llm_service,
+        limit=request.limit or 10,
+        min_price=request.min_price,
+        max_price=request.max_price,
+        brands=[request.brand.value] if request.brand else None,
+        mode=request.mode.value,
+    )
     print("results", results)
 
-    for doc in results:
-        specs = doc.get("technical_specs", {})
-        for field in ["weight", "memory", "processor"]:
-            if field in specs and isinstance(specs[field], list):
-                specs[field] = specs[field][0]
-        doc["technical_specs"] = specs
-
-    raw_data = json.dumps(results, indent=2)
-    summary = await llm_service.summarize_text(raw_data)
+    summary = await summary_cache.summarize(results, llm_service)
 
     return summary
 
@@ -308,127 +440,103 @@ class QueryRequest(BaseModel):
     session_id: str
 
 
-@app.post("/chat", response_model=dict)
-async def process_query(request: QueryRequest = Body(...)):
-    try:
-        print(
-            f"==> New /chat call | session_id: {request.session_id or 'new'} | query: {request.query}"
-        )
-
-        query_text = request.query
-        current_date = ""
-        try:
-            if "ChatSessions" not in await mongodb.database.list_collection_names():
-                print("Creating collection 'ChatSessions'...")
-                await mongodb.database.create_collection("ChatSessions")
-            # Session collection inside your main db
-            session_collection = mongodb.database["ChatSessions"]
-            session_collection.create_index(
-                [("session_id", 1), ("user_id", 1), ("app_name", 1)],
-                name="session_lookup_index",
-                background=True,
-            )
-            print("Session collection created with index.")
-        except Exception as e:
-            print(f"Error creating session collection: {e}")
-
-        session_service = MongoSessionService(collection=session_collection)
-        APP_NAME = "LaptopIntelligence"
+async def prepare_chat_session(request: QueryRequest):
+    """
+    Shared /chat setup: look up the cached runner, load or create the session
+    and record the user query. Returns (runner, session_id).
+    """
+    query_text = request.query
+    current_date = ""
+    session_service = get_session_service()
 
-        try:
-            llm_service = get_llm_service()
-            adk_runner = llm_service.create_base_agent(APP_NAME, session_service)
-            print("ADK Runner created successfully.", adk_runner)
+    try:
+        adk_runner = runner_registry.get(APP_NAME)
 
-        except Exception as e:
-            print(f"Failed to create adk_runner: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail="Unable to initialize LLM runner. Check server logs for details.",
-            )
+    except Exception as e:
+        print(f"Failed to create adk_runner: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Unable to initialize LLM runner. Check server logs for details.",
+        )
 
-        if adk_runner is None:
-            raise HTTPException(
-                status_code=500,
-                detail="LLM runner was not created successfully.",
-            )
+    if adk_runner is None:
+        raise HTTPException(
+            status_code=500,
+            detail="LLM runner was not created successfully.",
+        )
 
-        session_id = request.session_id or str(uuid.uuid4())
-        print(f"Using session_id: {session_id}")
+    session_id = request.session_id or str(uuid.uuid4())
+    print(f"Using session_id: {session_id}")
 
-        session = await session_service.get_session(
+    session = await session_service.get_session(
+        app_name=APP_NAME,
+        user_id=request.user_id,
+        session_id=session_id,
+    )
+    print("Session retrieved:", session)
+    if session is None:
+        # Create fresh session if not exists
+        print("Creating new session...")
+        await session_service.create_session(
             app_name=APP_NAME,
             user_id=request.user_id,
             session_id=session_id,
+            state={
+                "interaction_history": [],
+                "user_query": query_text,
+                "current_date": current_date,
+                "price_range": {},
+                "context": "",
+                "session_id": session_id,
+                "user_id": request.user_id,
+                "app_name": APP_NAME,
+            },
+        )
+    else:
+        session_state = session.state.copy()
+        session_state.update(
+            {
+                "user_query": query_text,
+                "current_date": current_date,
+            }
         )
-        print("Session retrieved:", session)
-        if session is None:
-            # Create fresh session if not exists
-            print("Creating new session...")
-            await session_service.create_session(
-                app_name=APP_NAME,
-                user_id=request.user_id,
-                session_id=session_id,
-                state={
-                    "interaction_history": [],
-                    "user_query": query_text,
-                    "current_date": current_date,
-                    "price_range": {},
-                    "context": "",
-                    "session_id": session_id,
-                    "user_id": request.user_id,
-                    "app_name": APP_NAME,
-                },
-            )
 
-            # Refresh to get new session
-            session = await session_service.get_session(
-                app_name=APP_NAME,
-                user_id=request.user_id,
-                session_id=session_id,
-            )
-        else:
-            session_state = session.state.copy()
-            session_state.update(
-                {
-                    "user_query": query_text,
-                    "current_date": current_date,
-                }
-            )
+        await session_service.create_session(
+            app_name=APP_NAME,
+            user_id=request.user_id,
+            session_id=session_id,
+            state=session_state,
+        )
 
-            await session_service.create_session(
-                app_name=APP_NAME,
-                user_id=request.user_id,
-                session_id=session_id,
-                state=session_state,
-            )
+    await add_user_query_to_history(
+        session_service,
+        APP_NAME,
+        request.user_id,
+        session_id,
+        query_text,
+    )
+    return adk_runner, session_id
 
-        print("Session state:", session.state, "app_name:", APP_NAME)
 
-        await add_user_query_to_history(
-            session_service,
-            APP_NAME,
-            request.user_id,
-            session_id,
-            query_text,
+@app.post("/chat", response_model=dict)
+async def process_query(request: QueryRequest = Body(...)):
+    try:
+        print(
+            f"==> New /chat call | session_id: {request.session_id or 'new'} | query: {request.query}"
         )
+        adk_runner, session_id = await prepare_chat_session(request)
 
-        # Construct user message
-        user_message = Content(role="user", parts=[Part(text=query_text)])
-        print(">>> Final company_id passed to agent:", session.state.get("company_id"))
         full_response = await call_agent_async(
             runner=adk_runner,
             user_id=request.user_id,
             session_id=session_id,
-            query=query_text,
+            query=request.query,
         )
         print(
-            f"[ logger ] Session state:",
-            session.state,
-            "app_name:",
+            f"[ logger ] app_name:",
             APP_NAME,
             "user_query",
-            query_text,
+            request.query,
             "full response:",
             full_response,
         )
@@ -440,3 +548,39 @@ async def process_query(request: QueryRequest = Body(...)):
         return JSONResponse(
             status_code=500, content={"detail": f"Internal Server Error: {str(e)}"}
         )
+
+
+@app.post("/chat/stream")
+async def stream_query(http_request: Request, request: QueryRequest = Body(...)):
+    """
+    Streaming /chat: server-sent events `session`, `tool_start`, `tool_end`,
+    `token` and `final` (or `error`). The agent run stops when the client disconnects.
+    """
+    print(
+        f"==> New /chat/stream call | session_id: {request.session_id or 'new'} | query: {request.query}"
+    )
+
+    async def events():
+        # Sent before any setup so the client gets its first byte right away
+        yield format_sse("session", {"session_id": request.session_id or None, "status": "started"})
+        try:
+            adk_runner, session_id = await prepare_chat_session(request)
+            yield format_sse("session", {"session_id": session_id, "status": "ready"})
+            stream = stream_agent_events(adk_runner, request.user_id, session_id, request.query)
+            async with aclosing(stream):
+                async for event, data in stream:
+                    if await http_request.is_disconnected():
+                        print(f"Client disconnected from /chat/stream session {session_id}")
+                        return
+                    yield format_sse(event, data)
+        except HTTPException as e:
+            yield format_sse("error", {"detail": e.detail})
+        except Exception as e:
+            print(f"Error during streamed agent run: {e}")
+            yield format_sse("error", {"detail": f"Internal Server Error: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -17,6 +17,11 @@ class Brand(str, Enum):
     LENOVO = "lenovo"
     HP = "hp"
 
+class LaptopCategory(str, Enum):
+    GENERAL = "general"
+    BUSINESS = "business"
+    GAMING = "gaming"
+
 class TechnicalSpecs(BaseModel):
     # Core
     processor_family: Optional[str] = None
@@ -84,6 +89,27 @@ class PriceHistory(BaseModel):
     date: datetime
     promo_applied: bool = False
 
+class PriceInterval(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+class PricePoint(BaseModel):
+    start: datetime
+    min: float
+    max: float
+    last: float
+    count: int
+
+class PriceHistorySeries(BaseModel):
+    sku: str
+    currency: Currency
+    interval: PriceInterval
+    start: datetime
+    end: datetime
+    points: List[PricePoint]
+
 class Review(BaseModel):
     rating: float = Field(ge=1, le=5)
     title: str
@@ -100,6 +126,10 @@ class Product(BaseModel):
     sku: str
     canonical_name: str
     technical_specs: TechnicalSpecs
+    # Intended use, assigned once at ingest (see categorizer.py)
+    category: Optional[LaptopCategory] = None
+    category_source: Optional[str] = None
+    category_version: Optional[int] = None
     
     # Marketplace data
     current_price: float
@@ -121,6 +151,57 @@ class Product(BaseModel):
     last_updated: datetime = Field(default_factory=datetime.utcnow)
     price_history: List[PriceHistory] = []
 
+class ProductSort(str, Enum):
+    ID = "id"
+    PRICE = "price"
+    RATING = "rating"
+    RECENCY = "recency"
+
+class ProductView(str, Enum):
+    SUMMARY = "summary"
+    FULL = "full"
+
+class ProductSummary(BaseModel):
+    """Product with every field optional, for projected responses (use response_model_exclude_unset)."""
+    id: Optional[str] = Field(default=None, alias="_id")
+    brand: Optional[Brand] = None
+    model: Optional[str] = None
+    sku: Optional[str] = None
+    canonical_name: Optional[str] = None
+    technical_specs: Optional[TechnicalSpecs] = None
+    category: Optional[LaptopCategory] = None
+    category_source: Optional[str] = None
+    category_version: Optional[int] = None
+    current_price: Optional[float] = None
+    currency: Optional[Currency] = None
+    availability: Optional[AvailabilityStatus] = None
+    shipping_eta: Optional[str] = None
+    promo_badges: Optional[List[str]] = None
+    seller: Optional[str] = None
+    review_count: Optional[int] = None
+    average_rating: Optional[float] = Field(default=None, ge=0, le=5)
+    reviews: Optional[List[Review]] = None
+    qa_excerpts: Optional[List[str]] = None
+    source_urls: Optional[List[str]] = None
+    embedding: Optional[List[float]] = None
+    last_updated: Optional[datetime] = None
+    price_history: Optional[List[PriceHistory]] = None
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def stringify_id(cls, value):
+        # Mongo assigns ObjectIds
+        return str(value) if value is not None else None
+
+class ProductPage(BaseModel):
+    items: List[ProductSummary]
+    next_cursor: Optional[str] = None
+
+class SearchMode(str, Enum):
+    HYBRID = "hybrid"
+    TEXT = "text"
+    VECTOR = "vector"
+
 class ChatMessage(BaseModel):
     role: str  # user, assistant, system
     content: str
@@ -0,0 +1,86 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+from bson.errors import InvalidId
+
+# Public sort names -> (document field, direction); `_id` breaks ties
+SORTS: Dict[str, Tuple[str, int]] = {
+    "id": ("_id", 1),
+    "price": ("current_price", 1),
+    "rating": ("average_rating", -1),
+    "recency": ("last_updated", -1),
+}
+
+# Upper bound on `limit` for paginated listings
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def sort_spec(sort: str) -> List[Tuple[str, int]]:
+    field, direction = SORTS[sort]
+    if field == "_id":
+        return [("_id", direction)]
+    return [(field, direction), ("_id", direction)]
+
+
+def encode_cursor(sort: str, document: dict) -> str:
+    """Opaque token pointing just past `document` in the given sort order."""
+    field, _ = SORTS[sort]
+    payload = json_util.dumps({"s": sort, "v": document.get(field), "id": document["_id"]})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort: str) -> Optional[dict]:
+    """Position stored in `token`, or None for an empty token (first page)."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        position = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    # ValueError covers bad base64, UTF-8 and JSON; the rest come from malformed extended-JSON
+    # values ($oid, $date, $numberDecimal, ...) in a crafted token
+    except (ValueError, ArithmeticError, IndexError, TypeError, KeyError, InvalidId) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if not isinstance(position, dict) or "id" not in position:
+        raise InvalidCursor("Malformed cursor")
+    if position.get("s") != sort:
+        raise InvalidCursor(f"Cursor was issued for sort '{position.get('s')}', not '{sort}'")
+    if SORTS[sort][0] != "_id" and "v" not in position:
+        raise InvalidCursor("Malformed cursor")
+    return position
+
+
+def keyset_filter(sort: str, position: Optional[dict]) -> Dict[str, Any]:
+    """
+    Filter selecting the documents after `position` in the given sort order.
+
+    MongoDB sorts null and missing values below everything else, i.e. first when
+    ascending and last when descending, while range operators never match them.
+    They are therefore matched explicitly, so documents without the sort field
+    (e.g. legacy products without `last_updated`) are not skipped.
+    """
+    if position is None:
+        return {}
+    field, direction = SORTS[sort]
+    op = "$gt" if direction == 1 else "$lt"
+    if field == "_id":
+        return {"_id": {op: position["id"]}}
+    value = position["v"]
+    if value is None:
+        after = [{field: None, "_id": {op: position["id"]}}]
+        if direction == 1:
+            after.append({field: {"$ne": None}})
+        return {"$or": after}
+    after = [
+        {field: {op: value}},
+        {field: value, "_id": {op: position["id"]}},
+    ]
+    if direction == -1:
+        after.append({field: None})
+    return {"$or": after}
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import certifi
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "pdfs"
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class CachedPdf:
+    url: str
+    sha256: str
+    path: Path
+    # True when the server answered 304 (or was unreachable) and the local copy was used
+    from_cache: bool = False
+
+
+class PdfCache:
+    """
+    Content-addressed on-disk cache for spec-sheet PDFs.
+
+    Blobs are stored as `<sha256>.pdf`; `index.json` maps each source URL to the
+    blob it last resolved to plus the validators (ETag / Last-Modified) needed
+    for conditional re-downloads. Extracted specs are memoized alongside each
+    blob as `<sha256>.specs.json`.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, timeout: int = 30):
+        self.cache_dir = Path(cache_dir or os.getenv("PDF_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.timeout = timeout
+        self._index_path = self.cache_dir / "index.json"
+        self._index: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            session = requests.Session()
+            retries = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+            )
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retries)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.verify = certifi.where()
+            self._session = session
+        return self._session
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.cache_dir / f"{sha256}.pdf"
+
+    def specs_path(self, sha256: str) -> Path:
+        return self.cache_dir / f"{sha256}.specs.json"
+
+    def load_specs(self, sha256: str, parser: str, parser_version: int) -> Optional[dict]:
+        """Return memoized specs for a blob if they came from the same parser version."""
+        try:
+            with open(self.specs_path(sha256), "r", encoding="utf-8") as f:
+                memo = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if memo.get("parser") != parser or memo.get("parser_version") != parser_version:
+            return None
+        return memo.get("specs")
+
+    def store_specs(self, sha256: str, parser: str, parser_version: int, specs: dict):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        memo = {
+            "sha256": sha256,
+            "parser": parser,
+            "parser_version": parser_version,
+            "parsed_at": datetime.utcnow().isoformat(),
+            "specs": specs,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(memo, f, indent=2)
+        os.replace(tmp_path, self.specs_path(sha256))
+
+    def _load_index(self) -> Dict[str, dict]:
+        if self._index is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp_path, self._index_path)
+
+    def lookup(self, url: str) -> Optional[CachedPdf]:
+        """Return the cached copy of `url` without touching the network."""
+        with self._lock:
+            entry = self._load_index().get(url)
+        if entry and self.blob_path(entry["sha256"]).exists():
+            return CachedPdf(url, entry["sha256"], self.blob_path(entry["sha256"]), True)
+        return None
+
+    def fetch(self, url: str) -> CachedPdf:
+        """Return the current PDF for `url`, re-downloading only if it changed."""
+        cached = self.lookup(url)
+        with self._lock:
+            entry = dict(self._load_index().get(url) or {})
+
+        headers = {}
+        if cached:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            if cached:
+                print(f"PDF refresh failed for {url}, using cached copy: {e}")
+                return cached
+            raise
+
+        with response:
+            if response.status_code == 304 and cached:
+                self._record(url, cached.sha256, response, entry)
+                return cached
+            response.raise_for_status()
+            sha256 = self._spool(response)
+
+        self._record(url, sha256, response, entry)
+        return CachedPdf(url, sha256, self.blob_path(sha256), False)
+
+    def _spool(self, response: requests.Response) -> str:
+        """Stream the response body to disk, hashing as it goes."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if chunk:
+                        digest.update(chunk)
+                        f.write(chunk)
+            sha256 = digest.hexdigest()
+            target = self.blob_path(sha256)
+            if target.exists():
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, target)
+            return sha256
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _record(self, url: str, sha256: str, response: requests.Response, entry: dict):
+        entry.update(
+            {
+                "sha256": sha256,
+                "fetched_at": datetime.utcnow().isoformat(),
+                "etag": response.headers.get("ETag") or entry.get("etag"),
+                "last_modified": response.headers.get("Last-Modified")
+                or entry.get("last_modified"),
+            }
+        )
+        with self._lock:
+            self._load_index()[url] = entry
+            self._save_index()
+
+
+pdf_cache = PdfCache()
@@ -1,259 +1,128 @@
-import requests
-import certifi
+import asyncio
+import multiprocessing
+import os
 import pdfplumber
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from datetime import datetime
 from io import BytesIO
-from typing import Dict
-import re
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
 
+from pdf_cache import CachedPdf, pdf_cache
+from spec_profiles import get_extractor
 
-class PDFParser:
-    @staticmethod
-    def download_pdf(url: str) -> BytesIO:
-        """Download PDF and return as file-like object"""
-        try:
+PdfSource = Union[str, Path, BytesIO]
 
-            response = requests.get(url, verify=certifi.where(), timeout=10)
-            response.raise_for_status()
-        except requests.exceptions.SSLError:
+# Bump whenever the extraction rules change; memoized specs from older versions are re-parsed
+PARSER_VERSION = 4
 
-            response = requests.get(url, verify=False, timeout=10)
-            response.raise_for_status()
-        return BytesIO(response.content)
 
-    @staticmethod
-    def parse_lenovo_specs(pdf_file: BytesIO) -> Dict:
-        """Parse Lenovo PSREF PDF specifications (extended)"""
-        specs = {}
-        with pdfplumber.open(pdf_file) as pdf:
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-
-            # Processor
-            processor_match = re.search(r"Processor Family\s*(.+)", text, re.IGNORECASE)
-            if processor_match:
-                specs["processor_family"] = processor_match.group(1).strip()
-
-            cpu_models = re.findall(r"(Core i[357]-\d{4,5}[A-Z]?)", text)
-            if cpu_models:
-                specs["processor_models"] = list(set(cpu_models))
-
-            # Graphics
-            graphics_match = re.findall(r"(Intel® UHD Graphics|Intel® Iris® Xe Graphics|NVIDIA® GeForce MX\d+)", text)
-            if graphics_match:
-                specs["graphics_options"] = list(set(graphics_match))
-
-            # Operating System
-            os_match = re.findall(r"(Windows® 11 [^\n]+|Ubuntu Linux|No preload operating system)", text)
-            if os_match:
-                specs["os_options"] = list(set(os_match))
-
-            # Memory
-            memory_match = re.search(r"Max Memory\s*([^\n]+)", text, re.IGNORECASE)
-            if memory_match:
-                specs["max_memory"] = memory_match.group(1).strip()
-
-            mem_type = re.search(r"Memory Type\s*([^\n]+)", text, re.IGNORECASE)
-            if mem_type:
-                specs["memory_type"] = mem_type.group(1).strip()
-
-            # Storage
-            storage_match = re.search(r"Max Storage Support[^\n]*\s*([^\n]+)", text, re.IGNORECASE)
-            if storage_match:
-                specs["max_storage"] = storage_match.group(1).strip()
-
-            storage_types = re.findall(r"M\.2 \d{4} SSD [^\n]+", text)
-            if storage_types:
-                specs["storage_types"] = storage_types
-
-            # Display
-            display_options = re.findall(r"14\" [^\n]+", text)
-            if display_options:
-                specs["display_options"] = display_options
-
-            # Audio
-            if "Dolby Atmos" in text:
-                specs["speakers"] = "Stereo speakers, Dolby Atmos"
-            if "Dolby Voice" in text:
-                specs["microphone"] = "Dual-microphone array, Dolby Voice"
-
-            # Camera
-            camera_options = re.findall(r"(720p|1080p(?: \+ IR)?)", text)
-            if camera_options:
-                specs["camera_options"] = camera_options
-
-            # Battery
-            battery_match = re.findall(r"(\d{2}Wh Rechargeable Li-ion Battery[^\n]*)", text)
-            if battery_match:
-                specs["battery_options"] = battery_match
-
-            battery_life = re.findall(r"MobileMark® 2018: up to [^\n]+", text)
-            if battery_life:
-                specs["battery_life"] = battery_life
-
-            # Power adapter
-            adapter_match = re.findall(r"65W USB-C®.*", text)
-            if adapter_match:
-                specs["power_adapter"] = adapter_match
-
-            # Dimensions & Weight
-            dim_match = re.search(r"Dimensions.*?\(([^\)]+)\)", text, re.IGNORECASE)
-            if dim_match:
-                specs["dimensions"] = dim_match.group(1).strip()
-
-            weight_match = re.findall(r"Starting at [\d\.]+ kg", text)
-            if weight_match:
-                specs["weight"] = weight_match
-
-            # Case materials & colors
-            case_match = re.findall(r"(Arctic grey|Graphite black)", text, re.IGNORECASE)
-            if case_match:
-                specs["case_colors"] = list(set(case_match))
-
-            # Connectivity
-            wlan_match = re.findall(r"(Wi-Fi® 6E?.*?Bluetooth® [\d\.]+)", text)
-            if wlan_match:
-                specs["wireless"] = wlan_match
-
-            ports = re.findall(r"(USB [^\n]+|Thunderbolt™ 4[^\n]+|HDMI® [^\n]+|RJ-45|Headphone / microphone combo)", text)
-            if ports:
-                specs["ports"] = list(set(ports))
-
-            # Security
-            if "TPM 2.0" in text:
-                specs["security_chip"] = "TPM 2.0"
-            if "fingerprint reader" in text:
-                specs["fingerprint_reader"] = True
-            if "Windows® Hello" in text:
-                specs["windows_hello"] = True
-
-            # Certifications
-            eco_certs = re.findall(r"(ENERGY STAR® 8.0|EPEAT™ Gold|TCO Certified 9.0|RoHS compliant)", text)
-            if eco_certs:
-                specs["green_certifications"] = eco_certs
-
-            if "MIL-STD-810H" in text:
-                specs["mil_certification"] = "MIL-STD-810H passed"
+PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS") or os.cpu_count() or 1)
 
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def brand_for_sku(sku: str) -> str:
+    return "lenovo" if "lenovo" in sku else "hp"
+
+
+class PDFParser:
+    @staticmethod
+    def download_pdf(url: str) -> Path:
+        """Fetch PDF through the local cache and return the path of the cached copy"""
+        return pdf_cache.fetch(url).path
+
+    @classmethod
+    def parse_specs(cls, pdf: CachedPdf, brand: str, force: bool = False) -> Dict:
+        """Parse a cached PDF, reusing memoized specs unless the PDF or parser changed"""
+        if not force:
+            specs = pdf_cache.load_specs(pdf.sha256, brand, PARSER_VERSION)
+            if specs is not None:
+                return specs
+
+        specs = cls.parse_with_profile(pdf.path, brand)
+        pdf_cache.store_specs(pdf.sha256, brand, PARSER_VERSION, specs)
         return specs
 
     @staticmethod
-    def parse_hp_specs(pdf_file: BytesIO) -> Dict:
-        """Parse HP datasheet PDF specifications (extended)"""
-        specs = {}
+    def iter_page_texts(pdf_file: PdfSource) -> Iterator[str]:
+        """Yield page texts one at a time, dropping each page's layout objects after use"""
         with pdfplumber.open(pdf_file) as pdf:
-            text = ""
             for page in pdf.pages:
-                text += page.extract_text() or ""
-
-            # Processor family & models
-            proc_family = re.search(r"Processor family\s*([\s\S]+?)Available Processors", text, re.IGNORECASE)
-            if proc_family:
-                specs["processor_family"] = proc_family.group(1).strip()
-
-            cpu_models = re.findall(r"Intel® Core™ i[357]-\d{4,5}[A-Z]?", text)
-            if cpu_models:
-                specs["processor_models"] = list(set(cpu_models))
-
-            if "Intel® Pentium" in text:
-                specs.setdefault("processor_models", []).append("Intel Pentium U300")
-
-            # Graphics
-            graphics_match = re.findall(r"(Intel® UHD Graphics|Intel® Iris® Xᶱ Graphics|NVIDIA® GeForce RTX™ 2050)", text)
-            if graphics_match:
-                specs["graphics_options"] = list(set(graphics_match))
-
-            # Operating Systems
-            os_match = re.findall(r"(Windows 11 [^\n]+|FreeDOS)", text)
-            if os_match:
-                specs["os_options"] = list(set(os_match))
-
-            # Memory
-            max_mem = re.search(r"Maximum memory\s*([^\n]+)", text, re.IGNORECASE)
-            if max_mem:
-                specs["max_memory"] = max_mem.group(1).strip()
-
-            mem_slots = re.search(r"Memory slots\s*([^\n]+)", text, re.IGNORECASE)
-            if mem_slots:
-                specs["memory_slots"] = mem_slots.group(1).strip()
-
-            # Storage
-            storage = re.findall(r"(?:\d+ GB|\d+ TB) PCIe® NVMe™ [^\n]+", text)
-            if storage:
-                specs["storage_types"] = storage
-            max_storage = re.search(r"Internal storage\s*([^\n]+)", text, re.IGNORECASE)
-            if max_storage:
-                specs["max_storage"] = max_storage.group(1).strip()
-
-            # Display
-            display_opts = re.findall(r"15\.6\" [^\n]+", text)
-            if display_opts:
-                specs["display_options"] = display_opts
-
-            # Audio
-            if "Dual stereo speakers" in text:
-                specs["speakers"] = "Dual stereo speakers"
-            if "dual array microphones" in text:
-                specs["microphone"] = "Dual array microphones"
-
-            # Camera
-            cam_opts = re.findall(r"(720p HD camera|IR Camera|5MP camera)", text, re.IGNORECASE)
-            if cam_opts:
-                specs["camera_options"] = list(set(cam_opts))
-
-            # Battery
-            battery = re.findall(r"(\d{2} Wh [^\n]+Battery)", text)
-            if battery:
-                specs["battery_options"] = battery
-
-            # Power adapter
-            adapters = re.findall(r"HP Smart \d+ W [^\n]+adapter", text)
-            if adapters:
-                specs["power_adapter"] = adapters
-
-            # Dimensions & Weight
-            dims = re.search(r"Dimensions\s*([^\n]+)", text, re.IGNORECASE)
-            if dims:
-                specs["dimensions"] = dims.group(1).strip()
-
-            weight = re.search(r"Weight\s*Starting at ([^\n]+)", text, re.IGNORECASE)
-            if weight:
-                specs["weight"] = weight.group(1).strip()
-
-            # Connectivity
-            wlan = re.findall(r"(Intel® Wi-Fi 6E [^\n]+|Realtek Wi-Fi 6E [^\n]+)", text)
-            if wlan:
-                specs["wireless"] = wlan
-
-            ports = re.findall(r"(USB Type-[AC][^\n]+|HDMI 2\.1|RJ-45|headphone/microphone combo)", text, re.IGNORECASE)
-            if ports:
-                specs["ports"] = list(set([p.strip() for p in ports]))
-
-            # Ethernet
-            eth = re.search(r"(10/100/1000 GbE NIC)", text)
-            if eth:
-                specs["ethernet"] = eth.group(1)
-
-            # Security
-            if "TPM 2.0" in text:
-                specs["security_chip"] = "TPM 2.0"
-            if "Fingerprint sensor" in text:
-                specs["fingerprint_reader"] = True
-            if "IR Camera" in text:
-                specs["windows_hello"] = True
-
-            # Certifications
-            eco = re.findall(r"(ENERGY STAR® certified|EPEAT® Gold|TCO Certified)", text)
-            if eco:
-                specs["green_certifications"] = eco
-            if "MIL-STD" in text:
-                specs["mil_certification"] = "MIL-STD tested"
-
-            # Sustainability
-            if "recycled" in text.lower():
-                specs["environmental_materials"] = ["Recycled plastics, packaging, low halogen"]
+                try:
+                    yield page.extract_text() or ""
+                finally:
+                    page.flush_cache()
+                    textmap_cache = getattr(getattr(page, "get_textmap", None), "cache_clear", None)
+                    if textmap_cache:
+                        textmap_cache()
+
+    @classmethod
+    def extract_text(cls, pdf_file: PdfSource) -> str:
+        """Extract the text of every page, one page per line block"""
+        return "\n".join(cls.iter_page_texts(pdf_file))
+
+    @classmethod
+    def parse_with_profile(cls, pdf_file: PdfSource, vendor: str) -> Dict:
+        """
+        Parse a datasheet with the declarative extraction profile of `vendor`.
+
+        Pages are fed to the extractor as they are read, so only two page texts
+        are held at a time. Reading stops early only when no later page can change
+        the result or the profile's `max_pages` is reached; the built-in profiles
+        read every page.
+        """
+        extractor = get_extractor(vendor)
+        if extractor is None:
+            raise ValueError(f"No spec extraction profile for vendor '{vendor}'")
+        with closing(cls.iter_page_texts(pdf_file)) as pages:
+            return extractor.extract_pages(pages)
+
+    @classmethod
+    def parse_lenovo_specs(cls, pdf_file: PdfSource) -> Dict:
+        """Parse Lenovo PSREF PDF specifications (extended)"""
+        return cls.parse_with_profile(pdf_file, "lenovo")
 
-        return specs
+    @classmethod
+    def parse_hp_specs(cls, pdf_file: PdfSource) -> Dict:
+        """Parse HP datasheet PDF specifications (extended)"""
+        return cls.parse_with_profile(pdf_file, "hp")
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Process pool for pdfplumber extraction, created on first use"""
+    global _parse_pool
+    if _parse_pool is None:
+        # spawn: forking a process that runs an event loop and driver threads is unsafe
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _parse_pool
+
+
+def shutdown_parse_pool():
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+def _parse_in_worker(url: str, sha256: str, path: str, brand: str, force: bool) -> Dict:
+    return PDFParser.parse_specs(CachedPdf(url, sha256, Path(path)), brand, force=force)
+
+
+async def parse_specs_async(pdf: CachedPdf, brand: str, force: bool = False) -> Dict:
+    """Parse specs in the process pool so extraction never blocks the event loop"""
+    if not force:
+        specs = pdf_cache.load_specs(pdf.sha256, brand, PARSER_VERSION)
+        if specs is not None:
+            return specs
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_parse_pool(), _parse_in_worker, pdf.url, pdf.sha256, str(pdf.path), brand, force
+    )
 
 
 # PDF URLs
@@ -264,19 +133,77 @@ CANONICAL_PDFS = {
     "hp_probook_440_g11": "https://h20195.www2.hp.com/v2/getpdf.aspx/c08947328.pdf",
 }
 
-# if __name__ == "__main__":
-#     parser = PDFParser()
 
-#     for name, url in CANONICAL_PDFS.items():
-#         print(f"\n--- Parsing {name} ---")
-#         try:
-#             pdf_file = parser.download_pdf(url)
-
-#             if "lenovo" in name:
-#                 specs = parser.parse_lenovo_specs(pdf_file)
-#             else:
-#                 specs = parser.parse_hp_specs(pdf_file)
-
-#             print("Extracted specs:", specs)
-#         except Exception as e:
-#             print(f"Failed to parse {name}: {e}")
+async def reparse_all(force: bool = False, update_db: bool = True):
+    """
+    Re-parse every canonical PDF (e.g. after a parser upgrade) and refresh stored specs.
+
+    Products whose specs changed are written through ProductWriter together with
+    a recomputed embedding and category, so product listeners see the change.
+    This runs as its own process: the shared Mongo tier of the summary cache is
+    invalidated here, while a running API rebuilds its in-memory search indexes
+    from the stored products on its next start.
+    """
+    from database import mongodb
+
+    writer = llm_service = None
+    if update_db:
+        # Imported lazily: parse workers import this module and need none of it
+        from categorizer import categorize
+        from ingestion import embed_product
+        from llm_service import close_llm_service, get_llm_service
+        from product_writer import ProductWriter, add_product_listener
+        from summary_cache import summary_cache
+
+        await mongodb.connect()
+        add_product_listener(summary_cache.apply_write)
+        writer = ProductWriter()
+        try:
+            llm_service = get_llm_service()
+        except ValueError as e:
+            print(f"LLM service unavailable, embeddings of changed products are left as they are: {e}")
+    try:
+        for sku, url in CANONICAL_PDFS.items():
+            try:
+                pdf = pdf_cache.lookup(url) or pdf_cache.fetch(url)
+                specs = await parse_specs_async(pdf, brand_for_sku(sku), force=force)
+                print(f"Parsed {sku} ({pdf.sha256[:12]}): {len(specs)} fields")
+                if not update_db:
+                    continue
+                stored = await mongodb.database.products.find_one(
+                    {"sku": sku},
+                    {"sku": 1, "brand": 1, "canonical_name": 1, "technical_specs": 1, "category": 1},
+                )
+                if stored is None or stored.get("technical_specs") == specs:
+                    continue
+                product = dict(stored, technical_specs=specs)
+                fields = {"technical_specs": specs, "last_updated": datetime.utcnow()}
+                fields.update(await categorize(product, llm_service))
+                if llm_service is not None:
+                    await embed_product(product, llm_service)
+                    fields["embedding"] = product["embedding"]
+                await writer.update(sku, {"$set": fields})
+            except Exception as e:
+                print(f"Failed to parse {sku}: {e}")
+        if writer is not None:
+            await writer.flush()
+    finally:
+        shutdown_parse_pool()
+        if update_db:
+            await close_llm_service()
+            await mongodb.disconnect()
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    arg_parser = argparse.ArgumentParser(description="Re-parse canonical spec-sheet PDFs")
+    arg_parser.add_argument(
+        "--force", action="store_true", help="ignore memoized specs and parse every PDF again"
+    )
+    arg_parser.add_argument(
+        "--no-db", action="store_true", help="only refresh the on-disk memo, not MongoDB"
+    )
+    args = arg_parser.parse_args()
+    asyncio.run(reparse_all(force=args.force, update_db=not args.no_db))
@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+
+class Stage:
+    """One step of a StagedPipeline with its own worker count and input queue."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        concurrency: int = 1,
+        queue_size: int = 0,
+    ):
+        self.name = name
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+
+class StagedPipeline:
+    """
+    Runs items through a sequence of stages concurrently.
+
+    Each stage pulls from its own bounded queue with `concurrency` workers and
+    hands its result to the next stage, so a slow stage only holds back the
+    items it is working on. A handler returning None drops the item; a handler
+    raising reports the error through `on_error` and drops the item.
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        on_error: Optional[Callable[[Any, str, Exception], None]] = None,
+    ):
+        if not stages:
+            raise ValueError("StagedPipeline needs at least one stage")
+        self.stages = stages
+        self.on_error = on_error
+
+    async def _worker(self, index: int, results: list):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            item = await stage.queue.get()
+            try:
+                output = await stage.handler(item)
+                if output is None:
+                    continue
+                if next_stage is not None:
+                    await next_stage.queue.put(output)
+                else:
+                    results.append(output)
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(item, stage.name, e)
+                else:
+                    print(f"Pipeline stage '{stage.name}' failed: {e}")
+            finally:
+                stage.queue.task_done()
+
+    async def run(self, items: Iterable[Any]) -> list:
+        """Feed `items` through every stage and return what the last stage produced."""
+        results: list = []
+        workers = [
+            [
+                asyncio.create_task(self._worker(index, results))
+                for _ in range(stage.concurrency)
+            ]
+            for index, stage in enumerate(self.stages)
+        ]
+        try:
+            for item in items:
+                await self.stages[0].queue.put(item)
+            # Items only move forward, so draining the stages in order drains the pipeline
+            for stage, stage_workers in zip(self.stages, workers):
+                await stage.queue.join()
+                for task in stage_workers:
+                    task.cancel()
+        finally:
+            all_workers = [task for stage_workers in workers for task in stage_workers]
+            for task in all_workers:
+                task.cancel()
+            await asyncio.gather(*all_workers, return_exceptions=True)
+        return results
@@ -0,0 +1,142 @@
+import os
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import List, Optional
+
+from pymongo import UpdateOne
+
+from database import mongodb
+
+COLLECTION = "price_history"
+# Buckets older than the retention window are removed by a TTL index on `day` (see schema.py)
+RETENTION_DAYS = int(os.getenv("PRICE_HISTORY_RETENTION_DAYS") or 3 * 365)
+# Raw samples are dropped from buckets older than this; their min/max/last stay
+COMPACT_AFTER_DAYS = int(os.getenv("PRICE_HISTORY_COMPACT_DAYS") or 90)
+
+# Intervals served from the per-day summaries vs. those that need raw samples
+SUMMARY_INTERVALS = ("day", "week", "month")
+SAMPLE_INTERVALS = ("hour",)
+
+
+@dataclass
+class PriceObservation:
+    sku: str
+    price: float
+    currency: str = "USD"
+    at: Optional[datetime] = None
+    promo_applied: bool = False
+
+
+def as_utc(at: datetime) -> datetime:
+    """Naive UTC datetime, as stored by pymongo."""
+    if at.tzinfo is None:
+        return at
+    return at.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def bucket_day(at: datetime) -> datetime:
+    return datetime.combine(at.date(), time.min)
+
+
+def observation_update(observation: PriceObservation) -> UpdateOne:
+    """Upsert into the (sku, day) bucket, keeping its running summary in step."""
+    at = observation.at or datetime.utcnow()
+    return UpdateOne(
+        {"sku": observation.sku, "day": bucket_day(at)},
+        {
+            "$setOnInsert": {"currency": observation.currency, "compacted": False},
+            "$min": {"min": observation.price},
+            "$max": {"max": observation.price, "last_at": at},
+            "$inc": {"count": 1},
+            "$set": {"last": observation.price},
+            "$push": {
+                "samples": {
+                    "at": at,
+                    "price": observation.price,
+                    "promo_applied": observation.promo_applied,
+                }
+            },
+        },
+        upsert=True,
+    )
+
+
+def downsample_pipeline(sku: str, start: datetime, end: datetime, interval: str) -> List[dict]:
+    """
+    Aggregation returning one {start, min, max, last, count} point per interval.
+
+    Day and coarser intervals only read the per-day bucket summaries; hourly
+    points unwind raw samples, which exist for the last COMPACT_AFTER_DAYS.
+    """
+    match = {"$match": {"sku": sku, "day": {"$gte": bucket_day(start), "$lte": end}}}
+    if interval in SAMPLE_INTERVALS:
+        return [
+            match,
+            {"$unwind": "$samples"},
+            {"$match": {"samples.at": {"$gte": start, "$lte": end}}},
+            {"$sort": {"samples.at": 1}},
+            {
+                "$group": {
+                    "_id": {"$dateTrunc": {"date": "$samples.at", "unit": interval}},
+                    "min": {"$min": "$samples.price"},
+                    "max": {"$max": "$samples.price"},
+                    "last": {"$last": "$samples.price"},
+                    "count": {"$sum": 1},
+                }
+            },
+            {"$sort": {"_id": 1}},
+            {"$project": {"_id": 0, "start": "$_id", "min": 1, "max": 1, "last": 1, "count": 1}},
+        ]
+    if interval not in SUMMARY_INTERVALS:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return [
+        match,
+        {"$sort": {"day": 1}},
+        {
+            "$group": {
+                "_id": {"$dateTrunc": {"date": "$day", "unit": interval}},
+                "min": {"$min": "$min"},
+                "max": {"$max": "$max"},
+                "last": {"$last": "$last"},
+                "count": {"$sum": "$count"},
+            }
+        },
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "start": "$_id", "min": 1, "max": 1, "last": 1, "count": 1}},
+    ]
+
+
+class PriceHistoryStore:
+    """Price observations bucketed per SKU and UTC day in their own collection."""
+
+    @property
+    def collection(self):
+        return mongodb.database[COLLECTION]
+
+    async def record(self, observations: List[PriceObservation]) -> int:
+        """Append observations in one unordered bulk write; returns how many were stored."""
+        if not observations:
+            return 0
+        result = await self.collection.bulk_write(
+            [observation_update(o) for o in observations], ordered=False
+        )
+        return result.upserted_count + result.modified_count
+
+    async def series(
+        self, sku: str, start: datetime, end: datetime, interval: str = "day"
+    ) -> List[dict]:
+        cursor = self.collection.aggregate(downsample_pipeline(sku, start, end, interval))
+        return await cursor.to_list(length=None)
+
+    async def compact(self, older_than_days: int = COMPACT_AFTER_DAYS) -> int:
+        """Drop raw samples from old buckets, keeping their per-day summary."""
+        cutoff = bucket_day(datetime.utcnow() - timedelta(days=older_than_days))
+        result = await self.collection.update_many(
+            {"day": {"$lt": cutoff}, "compacted": False},
+            {"$unset": {"samples": ""}, "$set": {"compacted": True}},
+        )
+        print(f"Compacted {result.modified_count} price-history buckets older than {cutoff:%Y-%m-%d}.")
+        return result.modified_count
+
+
+price_history = PriceHistoryStore()
@@ -0,0 +1,75 @@
+from typing import List, Optional
+
+from database import mongodb
+from text_index import reciprocal_rank_fusion, text_index
+from vector_index import vector_index
+
+
+def flatten_specs(results: List[dict]) -> List[dict]:
+    """Collapse list-valued headline specs to their first value for the summarizer."""
+    for doc in results:
+        specs = doc.get("technical_specs", {})
+        for field in ["weight", "memory", "processor"]:
+            if field in specs and isinstance(specs[field], list):
+                specs[field] = specs[field][0]
+        doc["technical_specs"] = specs
+    return results
+
+
+def price_filter(min_price: Optional[float] = None, max_price: Optional[float] = None) -> dict:
+    price_range = {}
+    if min_price is not None:
+        price_range["$gte"] = float(min_price)
+    if max_price is not None:
+        price_range["$lte"] = float(max_price)
+    return {"current_price": price_range} if price_range else {}
+
+
+async def search_products(
+    query: str,
+    llm_service,
+    limit: int = 10,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    brands: Optional[List[str]] = None,
+    mode: str = "hybrid",
+) -> List[dict]:
+    """
+    Products most relevant to `query` within the price/brand filters.
+
+    `mode` selects BM25 keyword ranking ("text"), embedding similarity ("vector")
+    or both fused with reciprocal rank fusion ("hybrid"). Rankers whose index is
+    empty are skipped; when none is left, or none ranks anything, the first
+    `limit` matching products are returned unranked.
+    """
+    match = price_filter(min_price, max_price)
+    if brands:
+        match["brand"] = {"$in": list(brands)}
+    projection = {"_id": 0, "embedding": 0}
+    filters = {
+        "min_price": float(min_price) if min_price is not None else None,
+        "max_price": float(max_price) if max_price is not None else None,
+        "brands": brands,
+    }
+    # Each ranker contributes a deeper list than requested so fusion has overlap to work with
+    depth = limit if mode != "hybrid" else max(limit * 5, 50)
+
+    rankings = []
+    if query and mode in ("text", "hybrid") and len(text_index):
+        rankings.append([sku for sku, _ in text_index.search(query, k=depth, **filters)])
+    if query and mode in ("vector", "hybrid") and len(vector_index):
+        query_embedding = await llm_service.get_embedding(query)
+        rankings.append([sku for sku, _ in vector_index.search(query_embedding, k=depth, **filters)])
+
+    # No ranker ran, or none matched anything (e.g. "laptops under 1000"): keep the filters
+    if not any(rankings):
+        cursor = mongodb.database.products.find(match, projection).limit(limit)
+        return flatten_specs(await cursor.to_list(length=limit))
+
+    ranked = rankings[0] if len(rankings) == 1 else [sku for sku, _ in reciprocal_rank_fusion(rankings)]
+    skus = ranked[:limit]
+    docs = {
+        doc["sku"]: doc
+        async for doc in mongodb.database.products.find({"sku": {"$in": skus}}, projection)
+    }
+    return flatten_specs([docs[sku] for sku in skus if sku in docs])
@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, Optional
+
+from models import Product, ProductView
+
+# Fields returned by list endpoints unless the caller asks for more
+SUMMARY_FIELDS = (
+    "brand",
+    "model",
+    "sku",
+    "canonical_name",
+    "category",
+    "current_price",
+    "currency",
+    "availability",
+    "promo_badges",
+    "review_count",
+    "average_rating",
+    "last_updated",
+)
+
+# Large fields only returned when named in `fields=`
+EXPLICIT_ONLY_FIELDS = ("embedding",)
+
+
+def _document_field(name: str) -> str:
+    top = name.split(".", 1)[0]
+    if top in ("id", "_id"):
+        return "_id"
+    if top not in Product.model_fields:
+        raise ValueError(f"Unknown field: {name}")
+    return name
+
+
+def parse_fields(fields: Optional[str]) -> Optional[list]:
+    """Split a comma-separated `fields=` value into document paths (dotted paths allowed)."""
+    if not fields:
+        return None
+    return [_document_field(name.strip()) for name in fields.split(",") if name.strip()]
+
+
+def build_projection(
+    view: ProductView, fields: Optional[str] = None, required: Iterable[str] = ()
+) -> Dict[str, int]:
+    """
+    Mongo projection for a product response.
+
+    `fields` wins over `view`; the summary view includes SUMMARY_FIELDS and the
+    full view everything except EXPLICIT_ONLY_FIELDS. `required` fields (e.g. the
+    pagination sort key) are always included in inclusion projections.
+    """
+    requested = parse_fields(fields)
+    if requested is None and view == ProductView.FULL:
+        return {name: 0 for name in EXPLICIT_ONLY_FIELDS}
+
+    names = requested if requested is not None else list(SUMMARY_FIELDS)
+    projection = {name: 1 for name in names}
+    for name in required:
+        if name != "_id":
+            projection.setdefault(name, 1)
+    # Drop paths that collide with a parent path already included
+    return {
+        name: 1
+        for name in projection
+        if not any(name.startswith(other + ".") for other in projection)
+    }
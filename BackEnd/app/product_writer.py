@@ -0,0 +1,126 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from database import mongodb
+
+
+# Called as listener(sku, fields) with the fields $set on each product a batch stored
+ProductListener = Callable[[str, Dict], None]
+_listeners: List[ProductListener] = []
+
+
+def add_product_listener(listener: ProductListener):
+    """Register a callback that keeps an in-memory view (e.g. a search index) in sync with writes."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _notify(sku: str, fields: Dict):
+    for listener in _listeners:
+        try:
+            listener(sku, fields)
+        except Exception as e:
+            print(f"[ProductWriter] listener {listener} failed for {sku}: {e}")
+
+
+@dataclass
+class BatchResult:
+    skus: List[str] = field(default_factory=list)
+    failed_skus: List[str] = field(default_factory=list)
+    upserted: int = 0
+    matched: int = 0
+    modified: int = 0
+    latency_ms: float = 0.0
+    # Set when the whole batch failed (network error, timeout, ...) rather than single writes
+    error: Optional[str] = None
+
+
+class ProductWriter:
+    """
+    Buffers product writes and sends them as unordered `bulk_write` batches.
+
+    Every write is an UpdateOne keyed by `sku` (upsert for full documents), so
+    re-ingesting a product is idempotent and a batch costs one round trip.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, collection=None):
+        self.batch_size = batch_size or int(os.getenv("PRODUCT_WRITE_BATCH") or 100)
+        self._collection = collection
+        self._pending: List[UpdateOne] = []
+        self._pending_skus: List[str] = []
+        self._pending_fields: List[Dict] = []
+        self._lock = asyncio.Lock()
+        self.batches = 0
+        self.totals = BatchResult()
+
+    @property
+    def collection(self):
+        return self._collection if self._collection is not None else mongodb.database.products
+
+    async def upsert(self, product: dict) -> Optional[BatchResult]:
+        """Queue a full product document, inserting it if the sku is new."""
+        document = {key: value for key, value in product.items() if key != "_id"}
+        document["last_updated"] = datetime.utcnow()
+        return await self.update(product["sku"], {"$set": document}, upsert=True)
+
+    async def update(self, sku: str, update: dict, upsert: bool = False) -> Optional[BatchResult]:
+        """Queue an update operation; flushes once a full batch is pending."""
+        self._pending.append(UpdateOne({"sku": sku}, update, upsert=upsert))
+        self._pending_skus.append(sku)
+        self._pending_fields.append(update.get("$set", {}))
+        if len(self._pending) >= self.batch_size:
+            return await self.flush()
+        return None
+
+    async def flush(self) -> Optional[BatchResult]:
+        async with self._lock:
+            if not self._pending:
+                return None
+            operations, self._pending = self._pending, []
+            skus, self._pending_skus = self._pending_skus, []
+            fields, self._pending_fields = self._pending_fields, []
+
+            batch = BatchResult(skus=skus)
+            started = time.perf_counter()
+            try:
+                result = await self.collection.bulk_write(operations, ordered=False)
+                details = result.bulk_api_result
+            except BulkWriteError as e:
+                details = e.details
+                batch.failed_skus = [skus[error["index"]] for error in details.get("writeErrors", [])]
+                print(f"[ProductWriter] {len(batch.failed_skus)} write errors: {details.get('writeErrors')}")
+            except PyMongoError as e:
+                # Unknown how much of an unordered batch landed, so every write in it counts as failed
+                details = {}
+                batch.failed_skus = list(skus)
+                batch.error = f"{type(e).__name__}: {e}"
+                print(f"[ProductWriter] batch of {len(operations)} ops failed: {batch.error}")
+            batch.latency_ms = (time.perf_counter() - started) * 1000
+            batch.upserted = details.get("nUpserted", 0)
+            batch.matched = details.get("nMatched", 0)
+            batch.modified = details.get("nModified", 0)
+
+            self.batches += 1
+            self.totals.upserted += batch.upserted
+            self.totals.matched += batch.matched
+            self.totals.modified += batch.modified
+            self.totals.failed_skus.extend(batch.failed_skus)
+            self.totals.latency_ms += batch.latency_ms
+            print(
+                f"[ProductWriter] batch {self.batches}: {len(operations)} ops, "
+                f"{batch.upserted} upserted, {batch.matched} matched, "
+                f"{batch.modified} modified, {len(batch.failed_skus)} failed "
+                f"in {batch.latency_ms:.1f} ms"
+            )
+            failed = set(batch.failed_skus)
+            for sku, changed in zip(skus, fields):
+                if sku not in failed:
+                    _notify(sku, changed)
+            return batch
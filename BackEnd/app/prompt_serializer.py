@@ -0,0 +1,153 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET") or 1500)
+# Longer option lists (e.g. every display SKU) are cut to this many entries
+MAX_OPTIONS = int(os.getenv("PROMPT_MAX_OPTIONS") or 4)
+
+# Top-level fields the summarizer uses, with the short labels they're written as
+PRODUCT_FIELDS = (
+    ("brand", "brand"),
+    ("category", "category"),
+    ("current_price", "price"),
+    ("availability", "stock"),
+    ("average_rating", "rating"),
+    ("review_count", "reviews"),
+)
+SPEC_FIELDS = (
+    ("processor_models", "cpu"),
+    ("processor_family", "cpu_family"),
+    ("graphics_options", "gpu"),
+    ("max_memory", "ram"),
+    ("memory_type", "ram_type"),
+    ("storage_types", "storage"),
+    ("max_storage", "max_storage"),
+    ("display_options", "display"),
+    ("os_options", "os"),
+    ("battery_life", "battery"),
+    ("weight", "weight"),
+    ("security_chip", "security"),
+    ("fingerprint_reader", "fingerprint"),
+    ("mil_certification", "mil_spec"),
+)
+
+_encoder: Optional[Callable[[str], List[int]]] = None
+_tokenizer_name: Optional[str] = None
+
+
+def _load_encoder():
+    """tiktoken if it and its encoding files are available, else a chars/4 estimate."""
+    global _encoder, _tokenizer_name
+    if _tokenizer_name is not None:
+        return
+    try:
+        import tiktoken
+
+        _encoder = tiktoken.get_encoding(os.getenv("PROMPT_TOKENIZER") or "cl100k_base").encode
+        _tokenizer_name = "tiktoken"
+    except Exception as e:
+        # tiktoken downloads its encodings on first use, which fails offline
+        print(f"[Prompt] tiktoken unavailable ({type(e).__name__}), estimating tokens")
+        _encoder = None
+        _tokenizer_name = "estimate"
+
+
+def count_tokens(text: str) -> int:
+    _load_encoder()
+    if _encoder is not None:
+        return len(_encoder(text))
+    return (len(text) + 3) // 4
+
+
+def _dedupe(values: List[Any]) -> List[str]:
+    seen, unique = set(), []
+    for value in values:
+        text = " ".join(str(value).split())
+        if text and text.lower() not in seen:
+            seen.add(text.lower())
+            unique.append(text)
+    return unique
+
+
+def _format_value(value: Any) -> Optional[str]:
+    if value is None or value == "" or value is False:
+        return None
+    if value is True:
+        return "yes"
+    if isinstance(value, float):
+        return f"{value:g}"
+    if isinstance(value, (list, tuple)):
+        options = _dedupe(value)
+        if not options:
+            return None
+        extra = len(options) - MAX_OPTIONS
+        shown = " | ".join(options[:MAX_OPTIONS])
+        return f"{shown} (+{extra} more)" if extra > 0 else shown
+    return " ".join(str(value).split())
+
+
+def serialize_product(doc: dict) -> str:
+    """One compact line per product: name followed by `label: value` pairs on allow-listed fields."""
+    parts = [str(doc.get("canonical_name") or doc.get("sku") or "unknown")]
+    for field, label in PRODUCT_FIELDS:
+        value = _format_value(doc.get(field))
+        if value is not None:
+            if field == "current_price" and doc.get("currency"):
+                value = f"{value} {doc['currency']}"
+            parts.append(f"{label}: {value}")
+    specs = doc.get("technical_specs") or {}
+    for field, label in SPEC_FIELDS:
+        value = _format_value(specs.get(field))
+        if value is not None:
+            parts.append(f"{label}: {value}")
+    return "; ".join(parts)
+
+
+@dataclass
+class PromptReport:
+    products_in: int
+    products_out: int
+    tokens: int
+    raw_tokens: int
+    budget: int
+    tokenizer: str
+
+
+# Running totals across calls, reported by /metrics
+prompt_stats: Dict[str, int] = {"calls": 0, "tokens": 0, "raw_tokens": 0, "products_dropped": 0}
+
+
+def serialize_products(results: List[dict], budget: int = PROMPT_TOKEN_BUDGET) -> Tuple[str, PromptReport]:
+    """
+    Compact prompt text for ranked results, within a token budget.
+
+    Products are added in rank order until the next one would exceed `budget`
+    (the first is always kept). The report compares against the indented JSON
+    the summarizer used to receive.
+    """
+    lines, tokens = [], 0
+    for doc in results:
+        line = serialize_product(doc)
+        line_tokens = count_tokens(line) + 1
+        if lines and tokens + line_tokens > budget:
+            break
+        lines.append(line)
+        tokens += line_tokens
+
+    text = "\n".join(lines)
+    report = PromptReport(
+        products_in=len(results),
+        products_out=len(lines),
+        tokens=count_tokens(text),
+        raw_tokens=count_tokens(json.dumps(results, indent=2, default=str)),
+        budget=budget,
+        tokenizer=_tokenizer_name,
+    )
+    prompt_stats["calls"] += 1
+    prompt_stats["tokens"] += report.tokens
+    prompt_stats["raw_tokens"] += report.raw_tokens
+    prompt_stats["products_dropped"] += report.products_in - report.products_out
+    print(f"[Prompt] {asdict(report)}")
+    return text, report
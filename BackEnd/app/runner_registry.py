@@ -0,0 +1,49 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from llm_service import get_llm_service
+from services import get_session_service
+
+RunnerKey = Tuple[str, str]
+
+
+class RunnerRegistry:
+    """
+    Agent runners built once per process, keyed by app name and chat model.
+
+    Every runner shares the process-wide session service, so a chat turn only
+    looks its runner up instead of constructing a model, agent and Runner.
+    """
+
+    def __init__(self):
+        self._runners: Dict[RunnerKey, object] = {}
+        self.build_ms: Dict[str, float] = {}
+
+    def _key(self, app_name: str) -> RunnerKey:
+        return (app_name, get_llm_service().chat_model)
+
+    def get(self, app_name: str):
+        """Cached runner for `app_name`, or None if it can't be built."""
+        key = self._key(app_name)
+        runner = self._runners.get(key)
+        if runner is None:
+            started = time.perf_counter()
+            runner = get_llm_service().create_base_agent(app_name, get_session_service())
+            if runner is None:
+                return None
+            self._runners[key] = runner
+            self.build_ms["/".join(key)] = round((time.perf_counter() - started) * 1000, 1)
+        return runner
+
+    def warm_up(self, *app_names: str) -> Dict[str, Optional[float]]:
+        """Build runners ahead of the first request; returns build time per app (None on failure)."""
+        return {
+            app_name: self.build_ms.get("/".join(self._key(app_name))) if self.get(app_name) else None
+            for app_name in app_names
+        }
+
+    def stats(self) -> dict:
+        return {"runners": len(self._runners), "build_ms": dict(self.build_ms)}
+
+
+runner_registry = RunnerRegistry()
@@ -0,0 +1,200 @@
+import argparse
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import CollectionInvalid
+
+from database import mongodb
+from price_history import COLLECTION as PRICE_HISTORY_COLLECTION, RETENTION_DAYS
+from summary_cache import COLLECTION as SUMMARY_CACHE_COLLECTION, TTL_SECONDS as SUMMARY_TTL_SECONDS
+
+# Bump when collections or indexes change in a way the spec fingerprint can't see
+SCHEMA_VERSION = 3
+META_COLLECTION = "schema_meta"
+SESSIONS_COLLECTION = "ChatSessions"
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    name: str
+    keys: Tuple[Tuple[str, int], ...]
+    options: Dict = field(default_factory=dict)
+
+
+INDEXES: List[IndexSpec] = [
+    IndexSpec("products", "sku_1", (("sku", ASCENDING),), {"unique": True}),
+    # /products filters: brand equality plus price and rating ranges
+    IndexSpec(
+        "products",
+        "brand_price_rating",
+        (("brand", ASCENDING), ("current_price", ASCENDING), ("average_rating", ASCENDING)),
+    ),
+    # /products?category= with the same price and rating ranges
+    IndexSpec(
+        "products",
+        "category_price_rating",
+        (("category", ASCENDING), ("current_price", ASCENDING), ("average_rating", ASCENDING)),
+    ),
+    IndexSpec("products", "price_rating", (("current_price", ASCENDING), ("average_rating", ASCENDING))),
+    # Keyset pagination sorts (pagination.SORTS), each tie-broken on _id
+    IndexSpec("products", "price_id", (("current_price", ASCENDING), ("_id", ASCENDING))),
+    IndexSpec("products", "rating_id", (("average_rating", DESCENDING), ("_id", DESCENDING))),
+    IndexSpec("products", "recency_id", (("last_updated", DESCENDING), ("_id", DESCENDING))),
+    IndexSpec(
+        SESSIONS_COLLECTION,
+        "session_lookup_index",
+        (("session_id", ASCENDING), ("user_id", ASCENDING), ("app_name", ASCENDING)),
+    ),
+    IndexSpec(
+        PRICE_HISTORY_COLLECTION,
+        "sku_day",
+        (("sku", ASCENDING), ("day", ASCENDING)),
+        {"unique": True},
+    ),
+    IndexSpec(
+        PRICE_HISTORY_COLLECTION,
+        "retention",
+        (("day", ASCENDING),),
+        {"expireAfterSeconds": RETENTION_DAYS * 24 * 3600},
+    ),
+    # Invalidation looks entries up by member sku
+    IndexSpec(SUMMARY_CACHE_COLLECTION, "skus_1", (("skus", ASCENDING),)),
+    IndexSpec(
+        SUMMARY_CACHE_COLLECTION,
+        "expiry",
+        (("created_at", ASCENDING),),
+        {"expireAfterSeconds": SUMMARY_TTL_SECONDS},
+    ),
+]
+
+# Single-field indexes that are now prefixes of the compound ones
+OBSOLETE_INDEXES = {"products": ["brand_1", "current_price_1", "average_rating_1"]}
+
+# Representative query shapes and the index each one must be served by
+QUERY_SHAPES = [
+    (
+        "products",
+        {"brand": "hp", "current_price": {"$gte": 0, "$lte": 5000}, "average_rating": {"$gte": 0}},
+        "brand_price_rating",
+    ),
+    ("products", {"current_price": {"$gte": 0, "$lte": 5000}, "average_rating": {"$gte": 0}}, "price_rating"),
+    (
+        "products",
+        {"category": "gaming", "current_price": {"$gte": 0, "$lte": 5000}, "average_rating": {"$gte": 0}},
+        "category_price_rating",
+    ),
+    (SESSIONS_COLLECTION, {"session_id": "s", "user_id": "u", "app_name": "a"}, "session_lookup_index"),
+]
+
+
+def schema_fingerprint() -> str:
+    spec = [(i.collection, i.name, i.keys, sorted(i.options.items())) for i in INDEXES]
+    return hashlib.sha256(json.dumps([SCHEMA_VERSION, spec]).encode()).hexdigest()
+
+
+def index_names(plan: dict) -> List[str]:
+    """Names of the indexes scanned anywhere in an explain() plan."""
+    names = []
+    if plan.get("stage") == "IXSCAN" and plan.get("indexName"):
+        names.append(plan["indexName"])
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            names.extend(index_names(plan[key]))
+    for child in plan.get("inputStages", []):
+        names.extend(index_names(child))
+    return names
+
+
+async def _ensure_collections(db):
+    existing = set(await db.list_collection_names())
+    for name in sorted({index.collection for index in INDEXES} - existing):
+        try:
+            await db.create_collection(name)
+            print(f"Created collection '{name}'.")
+        except CollectionInvalid:
+            pass
+
+
+async def _ensure_index(db, index: IndexSpec):
+    collection = db[index.collection]
+    current = (await collection.index_information()).get(index.name)
+    ttl = index.options.get("expireAfterSeconds")
+    if current and ttl is not None and current.get("expireAfterSeconds") != ttl:
+        # TTL changes are applied in place instead of rebuilding the index
+        await db.command(
+            "collMod",
+            index.collection,
+            index={"name": index.name, "expireAfterSeconds": ttl},
+        )
+        return
+    if current is None:
+        await collection.create_index(list(index.keys), name=index.name, **index.options)
+        print(f"Created index {index.collection}.{index.name}.")
+
+
+async def verify_indexes(db) -> Dict[str, bool]:
+    """explain() each query shape and check it is answered by its intended index."""
+    results = {}
+    for collection, query, expected in QUERY_SHAPES:
+        plan = await db[collection].find(query).explain()
+        used = index_names(plan.get("queryPlanner", {}).get("winningPlan", {}))
+        results[expected] = expected in used
+        if not results[expected]:
+            print(f"Warning: {collection} query {query} uses {used or 'a collection scan'}, not {expected}.")
+    return results
+
+
+async def bootstrap_schema(db=None, force: bool = False) -> Optional[dict]:
+    """
+    Create collections and indexes once per schema version.
+
+    A single schema_meta lookup short-circuits boots where the stored version
+    and index fingerprint already match this build.
+    """
+    db = db if db is not None else mongodb.database
+    fingerprint = schema_fingerprint()
+    meta = await db[META_COLLECTION].find_one({"_id": "schema"})
+    if not force and meta and meta.get("version") == SCHEMA_VERSION and meta.get("fingerprint") == fingerprint:
+        return None
+
+    print(f"Applying schema version {SCHEMA_VERSION}...")
+    await _ensure_collections(db)
+    for index in INDEXES:
+        await _ensure_index(db, index)
+    for collection, names in OBSOLETE_INDEXES.items():
+        existing = await db[collection].index_information()
+        for name in names:
+            if name in existing:
+                await db[collection].drop_index(name)
+                print(f"Dropped obsolete index {collection}.{name}.")
+
+    meta = {
+        "version": SCHEMA_VERSION,
+        "fingerprint": fingerprint,
+        "applied_at": datetime.utcnow(),
+        "verified": await verify_indexes(db),
+    }
+    await db[META_COLLECTION].replace_one({"_id": "schema"}, meta, upsert=True)
+    print(f"Schema version {SCHEMA_VERSION} applied.")
+    return meta
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create MongoDB collections and indexes.")
+    parser.add_argument("--force", action="store_true", help="re-apply even if the stored version matches")
+    args = parser.parse_args()
+
+    async def main():
+        await mongodb.connect()
+        try:
+            await bootstrap_schema(force=args.force)
+        finally:
+            await mongodb.disconnect()
+
+    asyncio.run(main())
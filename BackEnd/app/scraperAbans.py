@@ -7,29 +7,42 @@ from selenium.webdriver.common.action_chains import ActionChains
 from bs4 import BeautifulSoup
 from typing import Dict, Optional
 from models import AvailabilityStatus
+import os
 import time
 import re
 
 
+def create_chrome_driver(headless: Optional[bool] = None):
+    """Start a Chrome driver; headless unless CHROME_HEADLESS=0"""
+    if headless is None:
+        headless = os.getenv("CHROME_HEADLESS", "1") != "0"
+    chrome_options = Options()
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1366,900")
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    return webdriver.Chrome(options=chrome_options)
+
+
 class BaseScraper:
-    def __init__(self):
-        self.driver = None
+    def __init__(self, driver=None):
+        # A driver passed in (e.g. from the browser pool) is owned by the caller
+        self.driver = driver
 
-    def setup_driver(self):
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        # chrome_options.add_argument("--headless")  #
-        self.driver = webdriver.Chrome(options=chrome_options)
+    def setup_driver(self, headless: Optional[bool] = None):
+        self.driver = create_chrome_driver(headless)
 
     def close_driver(self):
         if self.driver:
             self.driver.quit()
+            self.driver = None
 
 
 class HpScraper(BaseScraper):
     BASE_URL = "https://laptopcare.lk"
+    PRODUCT_LINK_SELECTOR = ".products section.product a"
 
     def search_and_scrape(self, model_name: str, scheduler: bool) -> Optional[Dict]:
         self.driver.get(self.BASE_URL)
@@ -62,7 +75,7 @@ class HpScraper(BaseScraper):
         try:
             first_product = WebDriverWait(self.driver, 20).until(
                 EC.element_to_be_clickable(
-                    (By.CSS_SELECTOR, ".products section.product a")
+                    (By.CSS_SELECTOR, self.PRODUCT_LINK_SELECTOR)
                 )
             )
             url = first_product.get_attribute("href")
@@ -79,7 +92,11 @@ class HpScraper(BaseScraper):
             return None
 
     def scrape_product_page(self) -> Dict:
-        soup = BeautifulSoup(self.driver.page_source, "html.parser")
+        return self.parse_product_page(self.driver.page_source)
+
+    @classmethod
+    def parse_product_page(cls, html: str) -> Dict:
+        soup = BeautifulSoup(html, "html.parser")
 
         # Title
         try:
@@ -92,7 +109,7 @@ class HpScraper(BaseScraper):
             raw_price = soup.select_one(
                 "p.price span.woocommerce-Price-amount"
             ).get_text(strip=True)
-            price = self.clean_price(raw_price)
+            price = cls.clean_price(raw_price)
         except:
             price = None
 
@@ -153,7 +170,8 @@ class HpScraper(BaseScraper):
             "images": images,
         }
 
-    def clean_price(self, price_str: str) -> float:
+    @staticmethod
+    def clean_price(price_str: str) -> float:
         if not price_str:
             return None
         cleaned = re.sub(r"[^\d.]", "", price_str)
@@ -164,13 +182,17 @@ class HpScraper(BaseScraper):
 
     def scrape_price_and_reviews(self) -> Dict:
         """Light scrape: only price, discount, stock"""
-        soup = BeautifulSoup(self.driver.page_source, "html.parser")
+        return self.parse_price_and_reviews(self.driver.page_source)
+
+    @classmethod
+    def parse_price_and_reviews(cls, html: str) -> Dict:
+        soup = BeautifulSoup(html, "html.parser")
 
         try:
             raw_price = soup.select_one(
                 "p.price span.woocommerce-Price-amount"
             ).get_text(strip=True)
-            price = self.clean_price(raw_price)
+            price = cls.clean_price(raw_price)
         except:
             price = None
 
@@ -8,6 +8,9 @@ from motor.motor_asyncio import AsyncIOMotorCollection
 from typing import Optional
 from datetime import datetime
 
+from database import mongodb
+from schema import SESSIONS_COLLECTION
+
 
 class MongoSessionService(BaseSessionService):
     """A session service that persists session state in MongoDB asynchronously using Motor."""
@@ -100,3 +103,14 @@ class MongoSessionService(BaseSessionService):
                 "session_id": session_id,
             }
         )
+
+
+_session_service: Optional[MongoSessionService] = None
+
+
+def get_session_service() -> MongoSessionService:
+    """Process-wide session service over the ChatSessions collection (needs a connected database)."""
+    global _session_service
+    if _session_service is None:
+        _session_service = MongoSessionService(collection=mongodb.database[SESSIONS_COLLECTION])
+    return _session_service
@@ -0,0 +1,216 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+FIRST = "first"  # first match anywhere after the anchor line, stripped
+ALL = "all"  # every match, in document order
+UNIQUE = "unique"  # every distinct match, in order of first appearance
+FLAG = "flag"  # the pattern occurs at least once -> store `value`
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """
+    One spec field of a vendor profile.
+
+    `anchors` are lowercase literals, at least one of which appears on the first
+    line of every match of `pattern`; the extractor only runs `pattern` on lines
+    that contain one of them. Patterns with a capture group
+    yield group 1, otherwise the whole match.
+    """
+
+    field: str
+    pattern: str
+    anchors: Tuple[str, ...]
+    mode: str = FIRST
+    ignore_case: bool = False
+    strip: bool = False
+    value: Any = True  # FLAG only; tuples are stored as lists
+    append: bool = False  # FLAG only: append `value` to a list field instead of setting it
+
+
+@dataclass(frozen=True)
+class VendorProfile:
+    name: str
+    rules: Tuple[FieldRule, ...]
+    # Read at most this many pages; only set it for vendors whose sheets keep every
+    # spec field within their first pages (trailing pages are then never laid out)
+    max_pages: Optional[int] = None
+
+
+class _CompiledRule:
+    __slots__ = ("rule", "regex", "group")
+
+    def __init__(self, rule: FieldRule):
+        if rule.mode not in (FIRST, ALL, UNIQUE, FLAG):
+            raise ValueError(f"{rule.field}: unknown mode '{rule.mode}'")
+        if not rule.anchors or any(a != a.lower() or not a for a in rule.anchors):
+            raise ValueError(f"{rule.field}: anchors must be non-empty lowercase literals")
+        self.rule = rule
+        self.regex = re.compile(rule.pattern, re.IGNORECASE if rule.ignore_case else 0)
+        self.group = 1 if self.regex.groups else 0
+
+
+class SpecExtractor:
+    """
+    Extracts every field of a VendorProfile from one lower-cased copy of the text.
+
+    Anchor literals are located with plain substring search, which is far cheaper
+    than running each field regex over the whole document (and cheaper than one
+    combined alternation regex under CPython's `re`). Field patterns then only
+    run on the candidate lines their anchors point at, in document order.
+    """
+
+    def __init__(self, profile: VendorProfile):
+        self.profile = profile
+        self.rules = [_CompiledRule(rule) for rule in profile.rules]
+        self._rules_by_anchor: Dict[str, List[int]] = {}
+        for index, rule in enumerate(profile.rules):
+            for anchor in rule.anchors:
+                self._rules_by_anchor.setdefault(anchor, []).append(index)
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        specs: Dict[str, Any] = {}
+        self._scan(text, specs)
+        return self._finalize(specs)
+
+    def session(self) -> "ExtractionSession":
+        return ExtractionSession(self)
+
+    def extract_pages(self, pages: Iterable[str]) -> Dict[str, Any]:
+        """Extract from page texts, stopping once the session is complete (see ExtractionSession)."""
+        session = self.session()
+        for text in pages:
+            session.feed(text)
+            if session.complete:
+                break
+        return session.result()
+
+    def _candidate_lines(self, lowered: str) -> Dict[int, set]:
+        """Map the start offset of every line containing an anchor to the rules it triggers."""
+        lines: Dict[int, set] = {}
+        for anchor, rule_indexes in self._rules_by_anchor.items():
+            position = lowered.find(anchor)
+            while position != -1:
+                line_start = lowered.rfind("\n", 0, position) + 1
+                lines.setdefault(line_start, set()).update(rule_indexes)
+                line_end = lowered.find("\n", position)
+                if line_end == -1:
+                    break
+                position = lowered.find(anchor, line_end + 1)
+        return lines
+
+    def _scan(self, text: str, specs: Dict[str, Any], offset: int = 0):
+        """
+        Apply the rules to `text`. List and flag rules skip lines before `offset`,
+        which were already scanned as part of the previous page.
+        """
+        exhausted: set = set()
+        # "İ" is the only character whose lower-case form is longer; keep offsets aligned
+        lowered = text.replace("İ", "i").lower()
+        candidates = self._candidate_lines(lowered)
+        for line_start in sorted(candidates):
+            line_end = text.find("\n", line_start)
+            if line_end == -1:
+                line_end = len(text)
+            for index in sorted(candidates[line_start]):
+                compiled = self.rules[index]
+                if line_start < offset and compiled.rule.mode != FIRST:
+                    continue
+                self._apply(compiled, text, line_start, line_end, specs, exhausted)
+
+    @staticmethod
+    def _apply(
+        compiled: _CompiledRule,
+        text: str,
+        start: int,
+        end: int,
+        specs: Dict[str, Any],
+        exhausted: set,
+    ):
+        rule = compiled.rule
+        if rule.mode == FIRST:
+            if rule.field in specs or rule.field in exhausted:
+                return
+            found = compiled.regex.search(text, start)
+            if found:
+                specs[rule.field] = found.group(compiled.group).strip()
+            else:
+                # Nothing from this line to the end of the text, so later lines can't match either
+                exhausted.add(rule.field)
+        elif rule.mode == FLAG:
+            if not compiled.regex.search(text, start, end):
+                return
+            if rule.append:
+                values = specs.setdefault(rule.field, [])
+                if rule.value not in values:
+                    values.append(rule.value)
+            elif isinstance(rule.value, tuple):
+                specs[rule.field] = list(rule.value)
+            else:
+                specs[rule.field] = rule.value
+        else:
+            values = [
+                found.group(compiled.group)
+                for found in compiled.regex.finditer(text, start, end)
+            ]
+            if rule.strip:
+                values = [value.strip() for value in values]
+            if values:
+                specs.setdefault(rule.field, []).extend(values)
+
+    def _finalize(self, specs: Dict[str, Any]) -> Dict[str, Any]:
+        for compiled in self.rules:
+            if compiled.rule.mode == UNIQUE and compiled.rule.field in specs:
+                specs[compiled.rule.field] = list(dict.fromkeys(specs[compiled.rule.field]))
+        return specs
+
+
+class ExtractionSession:
+    """
+    Incremental extraction over a document fed one page at a time.
+
+    Each page is scanned together with the one before it, so a match may span
+    one page break, and only the previous page's text is kept. Lines of the
+    previous page are only revisited by single-valued (FIRST) rules that have
+    not matched yet; list and flag rules already took their values from them,
+    so nothing is counted twice. The result equals `SpecExtractor.extract` on
+    the joined pages as long as no match spans more than one page break.
+
+    A FIRST field can't change once matched, so a profile made only of FIRST
+    rules is complete once all of them are filled. List and flag rules can
+    gain values on any page; such profiles are read to the end unless they set
+    `max_pages`.
+    """
+
+    def __init__(self, extractor: SpecExtractor):
+        self.extractor = extractor
+        self.specs: Dict[str, Any] = {}
+        self.pages = 0
+        profile = extractor.profile
+        self._max_pages = profile.max_pages
+        self._settling_fields = (
+            {rule.field for rule in profile.rules}
+            if all(rule.mode == FIRST for rule in profile.rules)
+            else None
+        )
+        self._previous: Optional[str] = None
+
+    def feed(self, text: str):
+        self.pages += 1
+        if self._previous is None:
+            self.extractor._scan(text, self.specs)
+        else:
+            window = self._previous + "\n" + text
+            self.extractor._scan(window, self.specs, offset=len(self._previous) + 1)
+        self._previous = text
+
+    @property
+    def complete(self) -> bool:
+        """True once no further page can change the result, or the page cap is reached."""
+        if self._max_pages is not None and self.pages >= self._max_pages:
+            return True
+        return self._settling_fields is not None and self._settling_fields.issubset(self.specs)
+
+    def result(self) -> Dict[str, Any]:
+        return self.extractor._finalize(self.specs)
@@ -0,0 +1,215 @@
+from typing import Dict, Optional
+
+from spec_extraction import ALL, FLAG, UNIQUE, FieldRule, SpecExtractor, VendorProfile
+
+# Display sizes such as 14", 15.6" or 16" followed by the panel description
+DISPLAY_PATTERN = r"\d{2}(?:\.\d)?\" [^\n]+"
+
+LENOVO_PSREF = VendorProfile(
+    name="lenovo",
+    rules=(
+        # Processor
+        FieldRule("processor_family", r"Processor Family\s*(.+)", ("processor family",), ignore_case=True),
+        FieldRule("processor_models", r"(Core i[357]-\d{4,5}[A-Z]?)", ("core i",), mode=UNIQUE),
+        # Graphics
+        FieldRule(
+            "graphics_options",
+            r"(Intel® UHD Graphics|Intel® Iris® Xe Graphics|NVIDIA® GeForce MX\d+)",
+            ("intel® uhd graphics", "intel® iris® xe graphics", "nvidia® geforce mx"),
+            mode=UNIQUE,
+        ),
+        # Operating System
+        FieldRule(
+            "os_options",
+            r"(Windows® 11 [^\n]+|Ubuntu Linux|No preload operating system)",
+            ("windows® 11 ", "ubuntu linux", "no preload operating system"),
+            mode=UNIQUE,
+        ),
+        # Memory
+        FieldRule("max_memory", r"Max Memory\s*([^\n]+)", ("max memory",), ignore_case=True),
+        FieldRule("memory_type", r"Memory Type\s*([^\n]+)", ("memory type",), ignore_case=True),
+        # Storage
+        FieldRule(
+            "max_storage",
+            r"Max Storage Support[^\n]*\s*([^\n]+)",
+            ("max storage support",),
+            ignore_case=True,
+        ),
+        FieldRule("storage_types", r"M\.2 \d{4} SSD [^\n]+", ("m.2 ",), mode=ALL),
+        # Display
+        FieldRule("display_options", DISPLAY_PATTERN, ('" ',), mode=ALL),
+        # Audio
+        FieldRule("speakers", r"Dolby Atmos", ("dolby atmos",), mode=FLAG, value="Stereo speakers, Dolby Atmos"),
+        FieldRule(
+            "microphone",
+            r"Dolby Voice",
+            ("dolby voice",),
+            mode=FLAG,
+            value="Dual-microphone array, Dolby Voice",
+        ),
+        # Camera
+        FieldRule("camera_options", r"(720p|1080p(?: \+ IR)?)", ("720p", "1080p"), mode=ALL),
+        # Battery
+        FieldRule(
+            "battery_options",
+            r"(\d{2}Wh Rechargeable Li-ion Battery[^\n]*)",
+            ("wh rechargeable li-ion battery",),
+            mode=ALL,
+        ),
+        FieldRule("battery_life", r"MobileMark® 2018: up to [^\n]+", ("mobilemark® 2018: up to ",), mode=ALL),
+        # Power adapter
+        FieldRule("power_adapter", r"65W USB-C®.*", ("65w usb-c®",), mode=ALL),
+        # Dimensions & Weight
+        FieldRule("dimensions", r"Dimensions.*?\(([^\)]+)\)", ("dimensions",), ignore_case=True),
+        FieldRule("weight", r"Starting at [\d\.]+ kg", ("starting at ",), mode=ALL),
+        # Case materials & colors
+        FieldRule(
+            "case_colors",
+            r"(Arctic grey|Graphite black)",
+            ("arctic grey", "graphite black"),
+            mode=UNIQUE,
+            ignore_case=True,
+        ),
+        # Connectivity
+        FieldRule("wireless", r"(Wi-Fi® 6E?.*?Bluetooth® [\d\.]+)", ("wi-fi® 6",), mode=ALL),
+        FieldRule(
+            "ports",
+            r"(USB [^\n]+|Thunderbolt™ 4[^\n]+|HDMI® [^\n]+|RJ-45|Headphone / microphone combo)",
+            ("usb ", "thunderbolt™ 4", "hdmi® ", "rj-45", "headphone / microphone combo"),
+            mode=UNIQUE,
+        ),
+        # Security
+        FieldRule("security_chip", r"TPM 2\.0", ("tpm 2.0",), mode=FLAG, value="TPM 2.0"),
+        FieldRule("fingerprint_reader", r"fingerprint reader", ("fingerprint reader",), mode=FLAG),
+        FieldRule("windows_hello", r"Windows® Hello", ("windows® hello",), mode=FLAG),
+        # Certifications
+        FieldRule(
+            "green_certifications",
+            r"(ENERGY STAR® 8.0|EPEAT™ Gold|TCO Certified 9.0|RoHS compliant)",
+            ("energy star® 8", "epeat™ gold", "tco certified 9", "rohs compliant"),
+            mode=ALL,
+        ),
+        FieldRule("mil_certification", r"MIL-STD-810H", ("mil-std-810h",), mode=FLAG, value="MIL-STD-810H passed"),
+    ),
+)
+
+HP_DATASHEET = VendorProfile(
+    name="hp",
+    rules=(
+        # Processor family & models
+        FieldRule(
+            "processor_family",
+            r"Processor family\s*([\s\S]+?)Available Processors",
+            ("processor family",),
+            ignore_case=True,
+        ),
+        FieldRule(
+            "processor_models", r"Intel® Core™ i[357]-\d{4,5}[A-Z]?", ("intel® core™ i",), mode=UNIQUE
+        ),
+        FieldRule(
+            "processor_models",
+            r"Intel® Pentium",
+            ("intel® pentium",),
+            mode=FLAG,
+            value="Intel Pentium U300",
+            append=True,
+        ),
+        # Graphics
+        FieldRule(
+            "graphics_options",
+            r"(Intel® UHD Graphics|Intel® Iris® Xᶱ Graphics|NVIDIA® GeForce RTX™ \d{4})",
+            ("intel® uhd graphics", "intel® iris® xᶱ graphics", "nvidia® geforce rtx™ "),
+            mode=UNIQUE,
+        ),
+        # Operating Systems
+        FieldRule("os_options", r"(Windows 11 [^\n]+|FreeDOS)", ("windows 11 ", "freedos"), mode=UNIQUE),
+        # Memory
+        FieldRule("max_memory", r"Maximum memory\s*([^\n]+)", ("maximum memory",), ignore_case=True),
+        FieldRule("memory_slots", r"Memory slots\s*([^\n]+)", ("memory slots",), ignore_case=True),
+        # Storage
+        FieldRule("storage_types", r"(?:\d+ GB|\d+ TB) PCIe® NVMe™ [^\n]+", ("pcie® nvme™ ",), mode=ALL),
+        FieldRule("max_storage", r"Internal storage\s*([^\n]+)", ("internal storage",), ignore_case=True),
+        # Display
+        FieldRule("display_options", DISPLAY_PATTERN, ('" ',), mode=ALL),
+        # Audio
+        FieldRule(
+            "speakers", r"Dual stereo speakers", ("dual stereo speakers",), mode=FLAG, value="Dual stereo speakers"
+        ),
+        FieldRule(
+            "microphone",
+            r"dual array microphones",
+            ("dual array microphones",),
+            mode=FLAG,
+            value="Dual array microphones",
+        ),
+        # Camera
+        FieldRule(
+            "camera_options",
+            r"(720p HD camera|IR Camera|5MP camera)",
+            ("720p hd camera", "ir camera", "5mp camera"),
+            mode=UNIQUE,
+            ignore_case=True,
+        ),
+        # Battery
+        FieldRule("battery_options", r"(\d{2} Wh [^\n]+Battery)", (" wh ",), mode=ALL),
+        # Power adapter
+        FieldRule("power_adapter", r"HP Smart \d+ W [^\n]+adapter", ("hp smart ",), mode=ALL),
+        # Dimensions & Weight
+        FieldRule("dimensions", r"Dimensions\s*([^\n]+)", ("dimensions",), ignore_case=True),
+        FieldRule("weight", r"Weight\s*Starting at ([^\n]+)", ("weight",), ignore_case=True),
+        # Connectivity
+        FieldRule(
+            "wireless",
+            r"(Intel® Wi-Fi 6E [^\n]+|Realtek Wi-Fi 6E [^\n]+)",
+            ("wi-fi 6e ",),
+            mode=ALL,
+        ),
+        FieldRule(
+            "ports",
+            r"(USB Type-[AC][^\n]+|HDMI 2\.1|RJ-45|headphone/microphone combo)",
+            ("usb type-", "hdmi 2.1", "rj-45", "headphone/microphone combo"),
+            mode=UNIQUE,
+            ignore_case=True,
+            strip=True,
+        ),
+        # Ethernet
+        FieldRule("ethernet", r"(10/100/1000 GbE NIC)", ("10/100/1000 gbe nic",)),
+        # Security
+        FieldRule("security_chip", r"TPM 2\.0", ("tpm 2.0",), mode=FLAG, value="TPM 2.0"),
+        FieldRule("fingerprint_reader", r"Fingerprint sensor", ("fingerprint sensor",), mode=FLAG),
+        FieldRule("windows_hello", r"IR Camera", ("ir camera",), mode=FLAG),
+        # Certifications
+        FieldRule(
+            "green_certifications",
+            r"(ENERGY STAR® certified|EPEAT® Gold|TCO Certified)",
+            ("energy star® certified", "epeat® gold", "tco certified"),
+            mode=ALL,
+        ),
+        FieldRule("mil_certification", r"MIL-STD", ("mil-std",), mode=FLAG, value="MIL-STD tested"),
+        # Sustainability
+        FieldRule(
+            "environmental_materials",
+            r"recycled",
+            ("recycled",),
+            mode=FLAG,
+            ignore_case=True,
+            value=("Recycled plastics, packaging, low halogen",),
+        ),
+    ),
+)
+
+VENDOR_PROFILES: Dict[str, VendorProfile] = {
+    profile.name: profile for profile in (LENOVO_PSREF, HP_DATASHEET)
+}
+
+_extractors: Dict[str, SpecExtractor] = {}
+
+
+def get_extractor(vendor: str) -> Optional[SpecExtractor]:
+    """Compiled extractor for a vendor profile, built once per process."""
+    if vendor not in _extractors:
+        profile = VENDOR_PROFILES.get(vendor)
+        if profile is None:
+            return None
+        _extractors[vendor] = SpecExtractor(profile)
+    return _extractors[vendor]
@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from database import mongodb
+from prompt_serializer import serialize_products
+
+COLLECTION = "summary_cache"
+TTL_SECONDS = int(os.getenv("SUMMARY_CACHE_TTL_SECONDS") or 6 * 3600)
+LRU_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE") or 512)
+
+# Fields that change on every write without changing what the summary says
+VOLATILE_FIELDS = ("last_updated",)
+
+
+def serialize_results(results: List[dict]) -> str:
+    """The exact text handed to the summarizer: compact, allow-listed and within the token budget."""
+    text, _ = serialize_products(results)
+    return text
+
+
+def summary_key(results: List[dict], prompt_version: int) -> str:
+    """Hash of the result set (order-insensitive, volatile fields dropped) and prompt version."""
+    normalized = sorted(
+        (
+            {key: value for key, value in doc.items() if key not in VOLATILE_FIELDS}
+            for doc in results
+        ),
+        key=lambda doc: str(doc.get("sku")),
+    )
+    payload = json.dumps([prompt_version, normalized], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SummaryCache:
+    """
+    Two-tier cache of LLM summaries for product result sets.
+
+    An in-process LRU answers repeats without I/O; a Mongo collection with a
+    TTL index shares summaries across workers and restarts. Entries record the
+    SKUs they summarize, and a product write evicts every entry containing it.
+    Concurrent misses for the same key share one LLM call.
+    """
+
+    def __init__(self, max_size: int = LRU_SIZE, ttl_seconds: int = TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lru: "OrderedDict[str, Tuple[float, str, Tuple[str, ...]]]" = OrderedDict()
+        self._keys_by_sku: Dict[str, Set[str]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.hits = {"memory": 0, "mongo": 0}
+        self.misses = 0
+
+    @property
+    def collection(self):
+        return mongodb.database[COLLECTION] if mongodb.database is not None else None
+
+    def _remember(self, key: str, summary: str, skus: Tuple[str, ...], created: Optional[float] = None):
+        self._lru[key] = (created or time.time(), summary, skus)
+        self._lru.move_to_end(key)
+        for sku in skus:
+            self._keys_by_sku.setdefault(sku, set()).add(key)
+        while len(self._lru) > self.max_size:
+            self._forget(next(iter(self._lru)))
+
+    def _forget(self, key: str):
+        entry = self._lru.pop(key, None)
+        if entry is None:
+            return
+        for sku in entry[2]:
+            keys = self._keys_by_sku.get(sku)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_sku[sku]
+
+    def _from_memory(self, key: str) -> Optional[str]:
+        entry = self._lru.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.ttl_seconds:
+            self._forget(key)
+            return None
+        self._lru.move_to_end(key)
+        return entry[1]
+
+    async def get(self, key: str) -> Optional[str]:
+        summary = self._from_memory(key)
+        if summary is not None:
+            self.hits["memory"] += 1
+            return summary
+        try:
+            doc = await self.collection.find_one({"_id": key})
+        except Exception as e:
+            print(f"[SummaryCache] lookup failed: {e}")
+            return None
+        if doc is None:
+            return None
+        self.hits["mongo"] += 1
+        # Mongo hands back naive UTC datetimes; .timestamp() alone would read them as local time
+        created = doc["created_at"].replace(tzinfo=timezone.utc).timestamp()
+        self._remember(key, doc["summary"], tuple(doc.get("skus", ())), created)
+        return doc["summary"]
+
+    async def put(self, key: str, summary: str, skus: Tuple[str, ...], prompt_version: int):
+        self._remember(key, summary, skus)
+        try:
+            await self.collection.replace_one(
+                {"_id": key},
+                {
+                    "summary": summary,
+                    "skus": list(skus),
+                    "prompt_version": prompt_version,
+                    "created_at": datetime.utcnow(),
+                },
+                upsert=True,
+            )
+        except Exception as e:
+            print(f"[SummaryCache] store failed: {e}")
+
+    async def summarize(self, results: List[dict], llm_service) -> str:
+        """Cached `llm_service.summarize_text` of the serialized results."""
+        prompt_version = llm_service.SUMMARY_PROMPT_VERSION
+        key = summary_key(results, prompt_version)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        # Registered before the first await so concurrent misses wait on this call
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            summary = await self.get(key)
+            if summary is None:
+                self.misses += 1
+                summary = await llm_service.summarize_text(serialize_results(results))
+                skus = tuple(sorted({str(doc["sku"]) for doc in results if doc.get("sku")}))
+                await self.put(key, summary, skus, prompt_version)
+            future.set_result(summary)
+            return summary
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark retrieved so an unawaited failure isn't logged
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def invalidate_sku(self, sku: str):
+        for key in list(self._keys_by_sku.get(sku, ())):
+            self._forget(key)
+        collection = self.collection
+        if collection is None:
+            return
+        task = asyncio.get_running_loop().create_task(collection.delete_many({"skus": sku}))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def apply_write(self, sku: str, fields: dict):
+        """Product-writer listener: a changed product invalidates its summaries."""
+        self.invalidate_sku(sku)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._lru), "hits": dict(self.hits), "misses": self.misses}
+
+
+summary_cache = SummaryCache()
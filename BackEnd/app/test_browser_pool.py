@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import pytest
+from browser_pool import BrowserPool, PooledDriver
+
+
+class FakeDriver:
+    def __init__(self, number):
+        self.number = number
+        self.quit_calls = 0
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class DriverFactory:
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        driver = FakeDriver(len(self.drivers))
+        self.drivers.append(driver)
+        return driver
+
+
+@pytest.fixture
+def killed(monkeypatch):
+    killed = []
+    monkeypatch.setattr(PooledDriver, "kill", lambda pooled: killed.append(pooled.driver))
+    return killed
+
+
+@pytest.mark.asyncio
+async def test_driver_is_reused_then_recycled_after_max_pages(monkeypatch):
+    monkeypatch.setattr(PooledDriver, "rss_mb", lambda pooled: 100.0)
+    factory = DriverFactory()
+    pool = BrowserPool(max_size=1, max_pages=2, driver_factory=factory)
+
+    used = [await pool.run(lambda driver: driver.number) for _ in range(3)]
+
+    assert used == [0, 0, 1]
+    assert factory.drivers[0].quit_calls == 1
+    assert factory.drivers[1].quit_calls == 0
+    assert pool.stats() == {"live": 1, "idle": 1, "max_size": 1}
+
+    await pool.close()
+    assert factory.drivers[1].quit_calls == 1
+    assert pool.stats()["live"] == 0
+
+
+@pytest.mark.asyncio
+async def test_driver_over_the_memory_cap_is_recycled(monkeypatch):
+    monkeypatch.setattr(PooledDriver, "rss_mb", lambda pooled: 2048.0)
+    factory = DriverFactory()
+    pool = BrowserPool(max_size=1, max_pages=25, max_rss_mb=1500, driver_factory=factory)
+
+    await pool.run(lambda driver: None)
+    await pool.run(lambda driver: None)
+
+    assert [driver.quit_calls for driver in factory.drivers] == [1, 1]
+    assert pool.stats()["idle"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_task_retires_its_driver(monkeypatch, killed):
+    monkeypatch.setattr(PooledDriver, "rss_mb", lambda pooled: None)
+    factory = DriverFactory()
+    pool = BrowserPool(max_size=1, driver_factory=factory)
+
+    def crash(driver):
+        raise RuntimeError("page crashed")
+
+    with pytest.raises(RuntimeError):
+        await pool.run(crash)
+
+    assert factory.drivers[0].quit_calls == 1
+    assert killed == []
+    assert await pool.run(lambda driver: driver.number) == 1
+
+
+@pytest.mark.asyncio
+async def test_task_over_the_timeout_gets_its_driver_killed(monkeypatch, killed):
+    monkeypatch.setattr(PooledDriver, "rss_mb", lambda pooled: None)
+    factory = DriverFactory()
+    pool = BrowserPool(max_size=1, task_timeout=0.05, driver_factory=factory)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.run(lambda driver: time.sleep(0.5))
+
+    assert killed == [factory.drivers[0]]
+    assert factory.drivers[0].quit_calls == 0
+    assert pool.stats() == {"live": 0, "idle": 0, "max_size": 1}
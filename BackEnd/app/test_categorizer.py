@@ -0,0 +1,138 @@
+import pytest
+from categorizer import (
+    CATEGORY_RULES_VERSION,
+    backfill_categories,
+    categorize,
+    classify_specs,
+    cpu_tier,
+    max_memory_gb,
+)
+from models import LaptopCategory
+
+
+def test_rules_follow_cpu_memory_and_gpu():
+    gaming = {
+        "processor_models": ["Core i5-13420H", "Core i7-13620H"],
+        "graphics_options": ["NVIDIA® GeForce RTX™ 3050"],
+        "max_memory": "Up to 32GB DDR5",
+    }
+    business = {
+        "processor_models": ["Core i5-1335U", "Core i7-1355U"],
+        "max_memory": "Up to 40GB DDR4-3200",
+        "security_chip": "TPM 2.0",
+        "fingerprint_reader": True,
+    }
+    general = {"processor_models": ["Intel Pentium U300"], "max_memory": "8 GB DDR4"}
+
+    assert cpu_tier(gaming) == 7
+    assert max_memory_gb(business) == 40
+    assert classify_specs(gaming) == LaptopCategory.GAMING
+    assert classify_specs(business) == LaptopCategory.BUSINESS
+    assert classify_specs(general) == LaptopCategory.GENERAL
+    # A gaming GPU alongside too little memory is not a gaming machine
+    assert classify_specs(dict(gaming, max_memory="8GB")) == LaptopCategory.GENERAL
+    assert classify_specs({"display_options": ['14" FHD']}) is None
+
+
+class FakeLLM:
+    def __init__(self, answer="Gaming."):
+        self.answer = answer
+        self.calls = 0
+
+    async def classify_laptop(self, text):
+        self.calls += 1
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        return self.answer
+
+
+@pytest.mark.asyncio
+async def test_llm_is_only_asked_when_rules_cannot_decide():
+    llm = FakeLLM()
+    sparse = {"sku": "X1", "canonical_name": "X1", "technical_specs": {}}
+    known = {"sku": "E14", "technical_specs": {"processor_models": ["Core i3-1315U"]}}
+
+    assert await categorize(known, llm) == {
+        "category": "general",
+        "category_source": "rules",
+        "category_version": CATEGORY_RULES_VERSION,
+    }
+    assert llm.calls == 0
+    fields = await categorize(sparse, llm)
+    assert (fields["category"], fields["category_source"]) == ("gaming", "llm")
+    assert llm.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_undecided_attempt_is_recorded_and_keeps_an_existing_category():
+    sparse = {"sku": "X1", "technical_specs": {}}
+
+    assert await categorize(sparse, FakeLLM(TimeoutError("provider down"))) == {
+        "category_source": "unknown",
+        "category_version": CATEGORY_RULES_VERSION,
+    }
+    assert await categorize(dict(sparse, category="business"), FakeLLM("no idea")) == {
+        "category_version": CATEGORY_RULES_VERSION,
+    }
+
+
+class Products:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def _iterate(self, query):
+        version = query["category_version"]["$ne"]
+        for doc in self.docs:
+            if doc.get("category_version") != version:
+                yield dict(doc)
+
+    def find(self, query, projection):
+        return self._iterate(query)
+
+
+class Database:
+    def __init__(self, docs):
+        self.products = Products(docs)
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.updates = []
+
+    async def update(self, sku, update):
+        self.updates.append((sku, update))
+
+
+@pytest.mark.asyncio
+async def test_backfill_only_writes_real_changes():
+    general_specs = {"processor_models": ["Core i3-1315U"]}
+    database = Database(
+        [
+            # Already categorized under the current rules: not selected
+            {
+                "sku": "a",
+                "technical_specs": general_specs,
+                "category": "general",
+                "category_version": CATEGORY_RULES_VERSION,
+            },
+            # Same answer under an older rules version: only the version moves
+            {
+                "sku": "b",
+                "technical_specs": general_specs,
+                "category": "general",
+                "category_source": "rules",
+                "category_version": 0,
+            },
+            # Undecided, with an existing category that must survive
+            {"sku": "c", "technical_specs": {}, "category": "business", "category_source": "llm"},
+        ]
+    )
+    writer = RecordingWriter()
+    llm = FakeLLM("no idea")
+
+    assert await backfill_categories(database, writer, llm) == 2
+    assert writer.updates == [
+        ("b", {"$set": {"category_version": CATEGORY_RULES_VERSION}}),
+        ("c", {"$set": {"category_version": CATEGORY_RULES_VERSION}}),
+    ]
+    assert llm.calls == 1
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from embedder import BatchingEmbedder, embedding_key
+
+
+class MemoryCollection:
+    def __init__(self):
+        self.docs = {}
+
+    def find(self, query, projection=None):
+        docs = [self.docs[key] for key in query["_id"]["$in"] if key in self.docs]
+
+        async def cursor():
+            for doc in docs:
+                yield doc
+
+        return cursor()
+
+    async def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            key = op._filter["_id"]
+            self.docs[key] = dict(op._doc["$set"], _id=key)
+
+
+class FakeProvider:
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_batched_and_deduplicated():
+    provider = FakeProvider()
+    embedder = BatchingEmbedder(provider, "model-a", max_wait_ms=5, collection=MemoryCollection())
+
+    vectors = await embedder.embed_many(["a", "bb", "a", "ccc"])
+
+    assert vectors == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0], [3.0, 1.0]]
+    assert provider.batches == [["a", "bb", "ccc"]]
+
+
+@pytest.mark.asyncio
+async def test_persistent_cache_skips_the_provider_across_processes():
+    collection = MemoryCollection()
+    await BatchingEmbedder(FakeProvider(), "model-a", max_wait_ms=1, collection=collection).embed("thinkpad")
+
+    provider = FakeProvider()
+    fresh = BatchingEmbedder(provider, "model-a", max_wait_ms=1, collection=collection)
+    assert await fresh.embed("thinkpad") == [8.0, 1.0]
+    assert provider.batches == []
+    assert fresh.stats["store_hits"] == 1
+
+    other_model = BatchingEmbedder(provider, "model-b", max_wait_ms=1, collection=collection)
+    await other_model.embed("thinkpad")
+    assert provider.batches == [["thinkpad"]]
+    assert embedding_key("model-a", "x") != embedding_key("model-b", "x")
+
+
+@pytest.mark.asyncio
+async def test_provider_errors_reach_every_waiter():
+    async def failing(texts):
+        raise RuntimeError("provider down")
+
+    embedder = BatchingEmbedder(failing, "model-a", max_wait_ms=1, collection=MemoryCollection())
+    results = await asyncio.gather(embedder.embed("a"), embedder.embed("b"), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,95 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+from http_scraper import BrowserRequired, HpHttpScraper
+
+SEARCH_PAGE = """<html><body><div class="products">
+<section class="product"><a href="/product/hp-probook-450-g10/">HP ProBook 450 G10</a></section>
+</div></body></html>"""
+
+NO_RESULTS_PAGE = """<html><body>
+<p class="woocommerce-info">No products were found matching your selection.</p>
+</body></html>"""
+
+PRODUCT_PAGE = """<html><body>
+<h1 class="product_title">HP ProBook 450 G10</h1>
+<p class="price"><span class="woocommerce-Price-amount">Rs 245,000.00</span></p>
+<p class="stock in-stock">In stock</p>
+<div class="woocommerce-product-details__short-description"><ul>
+<li>Processor: Intel Core i5-1335U</li><li>RAM: 8GB DDR4</li><li>Backlit keyboard</li>
+</ul></div>
+</body></html>"""
+
+JS_SHELL = """<html><body><div id="root"></div><script src="/app.js"></script></body></html>"""
+
+
+class StorefrontHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/" and "s" in query:
+            body = SEARCH_PAGE if "450" in query["s"][0] else NO_RESULTS_PAGE
+        elif url.path == "/product/hp-probook-450-g10/":
+            body = PRODUCT_PAGE
+        elif url.path.startswith("/shell"):
+            body = JS_SHELL
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def storefront():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StorefrontHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_scrapes_product_page_over_http(storefront):
+    async with httpx.AsyncClient() as client:
+        scraper = HpHttpScraper(base_url=storefront, client=client)
+        result = await scraper.search_and_scrape("HP ProBook 450 G10", scheduler=False)
+
+    assert result["title"] == "HP ProBook 450 G10"
+    assert result["price"] == 245000.0
+    assert result["in_stock"] == "in_stock"
+    assert result["specs"]["Processor"] == "Intel Core i5-1335U"
+
+
+@pytest.mark.asyncio
+async def test_light_scrape_returns_price_and_stock(storefront):
+    async with httpx.AsyncClient() as client:
+        scraper = HpHttpScraper(base_url=storefront, client=client)
+        result = await scraper.search_and_scrape("HP ProBook 450 G10", scheduler=True)
+
+    assert result == {"price": 245000.0, "discount": None, "in_stock": "in_stock"}
+
+
+@pytest.mark.asyncio
+async def test_no_search_results_returns_none(storefront):
+    async with httpx.AsyncClient() as client:
+        scraper = HpHttpScraper(base_url=storefront, client=client)
+        assert await scraper.search_and_scrape("HP ZBook", scheduler=False) is None
+
+
+@pytest.mark.asyncio
+async def test_js_only_page_requires_browser(storefront):
+    async with httpx.AsyncClient() as client:
+        scraper = HpHttpScraper(base_url=f"{storefront}/shell", client=client)
+        with pytest.raises(BrowserRequired):
+            await scraper.search_and_scrape("HP ProBook 450 G10", scheduler=False)
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from llm_client import LLMClient
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_retried_then_counted():
+    client = LLMClient(concurrency=2, timeout=0.01, max_retries=2, backoff=0)
+    attempts = []
+
+    async def slow_then_fast():
+        attempts.append(1)
+        if len(attempts) < 3:
+            await asyncio.sleep(1)
+        return "ok"
+
+    assert await client.call("summarize", slow_then_fast) == "ok"
+    stats = client.snapshot()["operations"]["summarize"]
+    assert (stats["calls"], stats["timeouts"], stats["retries"], stats["errors"]) == (1, 2, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_errors_fail_fast():
+    client = LLMClient(max_retries=3, backoff=0)
+    attempts = []
+
+    async def broken():
+        attempts.append(1)
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        await client.call("summarize", broken)
+    assert len(attempts) == 1
+    assert client.snapshot()["operations"]["summarize"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_caps_calls_in_flight():
+    client = LLMClient(concurrency=3, timeout=1, backoff=0)
+    running = peak = 0
+
+    async def request():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return running
+
+    await asyncio.gather(*(client.call("embedding", request) for _ in range(12)))
+    assert peak == 3
@@ -0,0 +1,73 @@
+import base64
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_filter, sort_spec
+
+
+def test_cursor_round_trips_sort_value_and_id():
+    doc = {"_id": ObjectId(), "last_updated": datetime(2024, 3, 5, 10, 0)}
+    position = decode_cursor(encode_cursor("recency", doc), "recency")
+
+    assert position["v"] == doc["last_updated"]
+    assert position["id"] == doc["_id"]
+
+
+def test_cursor_is_bound_to_its_sort():
+    token = encode_cursor("price", {"_id": ObjectId(), "current_price": 999.0})
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "rating")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", "price")
+
+
+def test_keyset_filter_follows_sort_direction():
+    oid = ObjectId()
+
+    assert keyset_filter("price", {"v": 10.0, "id": oid}) == {
+        "$or": [
+            {"current_price": {"$gt": 10.0}},
+            {"current_price": 10.0, "_id": {"$gt": oid}},
+        ]
+    }
+    assert keyset_filter("rating", {"v": 4.5, "id": oid})["$or"][0] == {"average_rating": {"$lt": 4.5}}
+    assert keyset_filter("rating", {"v": 4.5, "id": oid})["$or"][2] == {"average_rating": None}
+    assert keyset_filter("id", {"v": oid, "id": oid}) == {"_id": {"$gt": oid}}
+    assert keyset_filter("price", None) == {}
+    assert sort_spec("rating") == [("average_rating", -1), ("_id", -1)]
+
+
+def test_keyset_filter_keeps_documents_missing_the_sort_field():
+    oid = ObjectId()
+
+    # Descending: nulls sort last, so later pages still reach them
+    assert keyset_filter("recency", {"v": datetime(2024, 3, 5), "id": oid})["$or"][-1] == {"last_updated": None}
+    assert keyset_filter("recency", {"v": None, "id": oid}) == {
+        "$or": [{"last_updated": None, "_id": {"$lt": oid}}]
+    }
+    # Ascending: nulls sort first, then every non-null value follows
+    assert keyset_filter("price", {"v": None, "id": oid}) == {
+        "$or": [
+            {"current_price": None, "_id": {"$gt": oid}},
+            {"current_price": {"$ne": None}},
+        ]
+    }
+
+
+@pytest.mark.parametrize(
+    "payload, sort",
+    [
+        ('{"s": "id", "id": {"$oid": "zz"}}', "id"),
+        ('{"s": "recency", "v": {"$date": "x"}, "id": 1}', "recency"),
+        ('{"s": "price", "v": {"$numberDecimal": "x"}, "id": 1}', "price"),
+        ('{"s": "price", "id": 1}', "price"),
+        ('[1, 2]', "price"),
+    ],
+)
+def test_crafted_cursors_are_rejected_as_invalid(payload, sort):
+    token = base64.urlsafe_b64encode(payload.encode()).decode()
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, sort)
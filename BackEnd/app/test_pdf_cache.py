@@ -0,0 +1,98 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from pdf_cache import CHUNK_SIZE, PdfCache
+
+# Several chunks long, so the download is spooled to disk piece by piece
+SHEET_V1 = b"%PDF-1.4 v1 " + b"x" * (3 * CHUNK_SIZE + 17)
+SHEET_V2 = b"%PDF-1.4 v2 " + b"y" * 1024
+LAST_MODIFIED = "Mon, 02 Oct 2023 10:00:00 GMT"
+
+
+class SpecSheetHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        etag = f'"{server.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        payload = server.sheets[server.version]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sheet_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SpecSheetHandler)
+    server.version = "v1"
+    server.sheets = {"v1": SHEET_V1, "v2": SHEET_V2}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/sheet.pdf"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_is_spooled_to_a_content_addressed_blob(sheet_server, tmp_path):
+    cache = PdfCache(str(tmp_path))
+    pdf = cache.fetch(sheet_server.url)
+
+    assert not pdf.from_cache
+    assert pdf.sha256 == hashlib.sha256(SHEET_V1).hexdigest()
+    assert pdf.path.read_bytes() == SHEET_V1
+    assert list(tmp_path.glob("*.part")) == []
+    assert cache.lookup(sheet_server.url).sha256 == pdf.sha256
+
+
+def test_unchanged_sheet_is_revalidated_with_a_conditional_get(sheet_server, tmp_path):
+    cache = PdfCache(str(tmp_path))
+    first = cache.fetch(sheet_server.url)
+    second = cache.fetch(sheet_server.url)
+
+    revalidation = sheet_server.requests[-1]
+    assert revalidation["If-None-Match"] == '"v1"'
+    assert revalidation["If-Modified-Since"] == LAST_MODIFIED
+    assert second.from_cache
+    assert second.sha256 == first.sha256
+
+    sheet_server.version = "v2"
+    third = cache.fetch(sheet_server.url)
+    assert not third.from_cache
+    assert third.path.read_bytes() == SHEET_V2
+    # Validators persist across instances through index.json
+    assert PdfCache(str(tmp_path)).fetch(sheet_server.url).from_cache
+
+
+def test_cached_copy_is_used_when_the_server_is_unreachable(sheet_server, tmp_path):
+    cache = PdfCache(str(tmp_path))
+    cached = cache.fetch(sheet_server.url)
+    sheet_server.shutdown()
+    sheet_server.server_close()
+    # No retry backoff against a closed port
+    cache._session = requests.Session()
+
+    offline = cache.fetch(sheet_server.url)
+    assert offline.from_cache
+    assert offline.sha256 == cached.sha256
+
+    # Nothing cached to fall back on: the error surfaces
+    uncached = PdfCache(str(tmp_path / "empty"))
+    uncached._session = requests.Session()
+    with pytest.raises(requests.exceptions.ConnectionError):
+        uncached.fetch(sheet_server.url)
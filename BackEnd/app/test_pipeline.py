@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from pipeline import Stage, StagedPipeline
+
+
+@pytest.mark.asyncio
+async def test_items_flow_through_every_stage_and_failures_are_dropped():
+    errors = []
+
+    async def parse(item):
+        if item == 3:
+            raise ValueError("bad sheet")
+        await asyncio.sleep(0.001 * (5 - item))
+        return item * 10
+
+    async def keep_even(item):
+        return item if item % 20 == 0 else None
+
+    async def label(item):
+        return f"sku-{item}"
+
+    pipeline = StagedPipeline(
+        [
+            Stage("parse", parse, concurrency=3),
+            Stage("filter", keep_even),
+            Stage("label", label, concurrency=2),
+        ],
+        on_error=lambda item, stage, error: errors.append((item, stage, str(error))),
+    )
+
+    results = await pipeline.run(range(6))
+
+    assert sorted(results) == ["sku-0", "sku-20", "sku-40"]
+    assert errors == [(3, "parse", "bad sheet")]
+
+
+@pytest.mark.asyncio
+async def test_slow_stage_holds_back_the_fast_one():
+    produced, consumed, lead = 0, 0, []
+
+    async def fetch(item):
+        nonlocal produced
+        produced += 1
+        lead.append(produced - consumed)
+        return item
+
+    async def write(item):
+        nonlocal consumed
+        consumed += 1
+        await asyncio.sleep(0.005)
+        return item
+
+    pipeline = StagedPipeline([Stage("fetch", fetch), Stage("write", write, queue_size=1)])
+
+    assert await pipeline.run(range(10)) == list(range(10))
+    # One item in the writer, one in its queue, one waiting on the put, one being fetched
+    assert max(lead) <= 4
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_run_cancels_every_worker():
+    started, cancelled = asyncio.Event(), []
+
+    async def hang(item):
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+
+    pipeline = StagedPipeline([Stage("scrape", hang, concurrency=2), Stage("write", hang)])
+    run = asyncio.create_task(pipeline.run(range(4)))
+    await started.wait()
+    await asyncio.sleep(0)
+    run.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await run
+    assert sorted(cancelled) == [0, 1]
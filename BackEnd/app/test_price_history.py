@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from price_history import PriceObservation, as_utc, downsample_pipeline, observation_update
+
+
+def test_observation_goes_into_its_day_bucket():
+    at = datetime(2024, 3, 5, 14, 30)
+    op = observation_update(PriceObservation(sku="x1", price=999.0, at=at, promo_applied=True))
+
+    assert op._filter == {"sku": "x1", "day": datetime(2024, 3, 5)}
+    assert op._upsert is True
+    assert op._doc["$min"] == {"min": 999.0}
+    assert op._doc["$push"]["samples"] == {"at": at, "price": 999.0, "promo_applied": True}
+
+
+def test_daily_series_reads_bucket_summaries_only():
+    pipeline = downsample_pipeline("x1", datetime(2024, 3, 5, 12), datetime(2024, 4, 1), "week")
+
+    assert pipeline[0]["$match"]["day"]["$gte"] == datetime(2024, 3, 5)
+    assert not any("$unwind" in stage for stage in pipeline)
+    assert pipeline[2]["$group"]["_id"] == {"$dateTrunc": {"date": "$day", "unit": "week"}}
+
+
+def test_hourly_series_unwinds_samples():
+    pipeline = downsample_pipeline("x1", datetime(2024, 3, 5), datetime(2024, 3, 6), "hour")
+
+    assert {"$unwind": "$samples"} in pipeline
+
+
+def test_unknown_interval_is_rejected():
+    with pytest.raises(ValueError):
+        downsample_pipeline("x1", datetime(2024, 3, 5), datetime(2024, 3, 6), "minute")
+
+
+def test_aware_datetimes_are_normalized_to_naive_utc():
+    aware = datetime(2024, 3, 5, 14, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+    assert as_utc(aware) == datetime(2024, 3, 5, 8, 30)
@@ -0,0 +1,52 @@
+import pytest
+
+import product_search
+from test_text_index import make_index
+from vector_index import VectorIndex
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def limit(self, n):
+        return Cursor(self.docs[:n])
+
+    async def to_list(self, length):
+        return self.docs[:length]
+
+
+class Products:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, match, projection):
+        price = match.get("current_price", {})
+        return Cursor(
+            [
+                dict(doc)
+                for doc in self.docs
+                if doc["current_price"] >= price.get("$gte", float("-inf"))
+                and doc["current_price"] <= price.get("$lte", float("inf"))
+            ]
+        )
+
+
+class Database:
+    def __init__(self, docs):
+        self.products = Products(docs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["text", "hybrid"])
+async def test_query_without_known_terms_falls_back_to_filtered_products(monkeypatch, mode):
+    docs = [
+        {"sku": "thinkpad_e14", "current_price": 900.0},
+        {"sku": "probook_450", "current_price": 1100.0},
+    ]
+    monkeypatch.setattr(product_search.mongodb, "database", Database(docs))
+    monkeypatch.setattr(product_search, "text_index", make_index())
+    monkeypatch.setattr(product_search, "vector_index", VectorIndex())
+
+    results = await product_search.search_products("laptops under 1000", None, max_price=1000, mode=mode)
+    assert [doc["sku"] for doc in results] == ["thinkpad_e14"]
@@ -0,0 +1,45 @@
+import pytest
+from models import ProductSummary, ProductView
+from product_views import SUMMARY_FIELDS, build_projection
+
+
+def test_summary_view_is_an_inclusion_projection():
+    projection = build_projection(ProductView.SUMMARY, required=["current_price"])
+
+    assert projection == {name: 1 for name in SUMMARY_FIELDS}
+    assert "embedding" not in projection
+
+
+def test_full_view_excludes_embedding():
+    assert build_projection(ProductView.FULL) == {"embedding": 0}
+
+
+def test_fields_override_view_and_keep_required_sort_key():
+    projection = build_projection(
+        ProductView.FULL, "sku, technical_specs.ports, embedding", required=["last_updated"]
+    )
+
+    assert projection == {
+        "sku": 1,
+        "technical_specs.ports": 1,
+        "embedding": 1,
+        "last_updated": 1,
+    }
+    assert build_projection(ProductView.SUMMARY, "technical_specs,technical_specs.ports") == {
+        "technical_specs": 1
+    }
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError):
+        build_projection(ProductView.SUMMARY, "sku,password")
+
+
+def test_summary_model_only_dumps_projected_fields():
+    item = ProductSummary.model_validate({"_id": "abc", "sku": "x1", "current_price": 999.0})
+
+    assert item.model_dump(by_alias=True, exclude_unset=True) == {
+        "_id": "abc",
+        "sku": "x1",
+        "current_price": 999.0,
+    }
@@ -0,0 +1,27 @@
+import product_writer
+import pytest
+from pymongo.errors import AutoReconnect
+from product_writer import ProductWriter
+
+
+class UnreachableCollection:
+    async def bulk_write(self, operations, ordered=True):
+        raise AutoReconnect("connection reset")
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_fail_the_whole_batch_without_notifying(monkeypatch):
+    notified = []
+    monkeypatch.setattr(product_writer, "_listeners", [lambda sku, fields: notified.append(sku)])
+    writer = ProductWriter(batch_size=10, collection=UnreachableCollection())
+    await writer.update("a", {"$set": {"current_price": 900.0}})
+    await writer.update("b", {"$set": {"current_price": 1100.0}})
+
+    batch = await writer.flush()
+
+    assert batch.skus == ["a", "b"]
+    assert batch.failed_skus == ["a", "b"]
+    assert batch.error.startswith("AutoReconnect")
+    assert writer.totals.failed_skus == ["a", "b"]
+    assert notified == []
+    assert await writer.flush() is None
@@ -0,0 +1,43 @@
+from prompt_serializer import count_tokens, serialize_product, serialize_products
+
+
+def laptop(sku, **specs):
+    return {
+        "sku": sku,
+        "canonical_name": f"ThinkPad {sku}",
+        "brand": "Lenovo",
+        "current_price": 250000.0,
+        "currency": "LKR",
+        "embedding": [0.1] * 64,
+        "pdf_url": "https://example.com/spec.pdf",
+        "technical_specs": specs,
+    }
+
+
+def test_allow_list_drops_noise_and_dedupes_options():
+    line = serialize_product(
+        laptop(
+            "E14",
+            processor_models=["Core i5-1335U", "core  i5-1335U", "Core i7-1355U"],
+            display_options=["A", "B", "C", "D", "E", "F"],
+            fingerprint_reader=True,
+            windows_hello=None,
+            ports=["USB-C"],
+        )
+    )
+    assert line == (
+        "ThinkPad E14; brand: Lenovo; price: 250000 LKR; "
+        "cpu: Core i5-1335U | Core i7-1355U; display: A | B | C | D (+2 more); fingerprint: yes"
+    )
+
+
+def test_budget_keeps_rank_order_and_reports():
+    results = [laptop(f"T{i}", processor_models=["Core i7-1355U"]) for i in range(10)]
+    one_line = count_tokens(serialize_product(results[0])) + 1
+    text, report = serialize_products(results, budget=one_line * 3)
+
+    assert text.splitlines()[0].startswith("ThinkPad T0;")
+    assert report.products_in == 10
+    assert report.products_out == 3
+    assert report.tokens < report.raw_tokens
+    assert report.budget == one_line * 3
@@ -0,0 +1,26 @@
+from schema import INDEXES, QUERY_SHAPES, index_names, schema_fingerprint
+
+
+def test_index_names_walks_nested_plans():
+    plan = {
+        "stage": "FETCH",
+        "inputStage": {
+            "stage": "OR",
+            "inputStages": [
+                {"stage": "IXSCAN", "indexName": "brand_price_rating"},
+                {"stage": "IXSCAN", "indexName": "price_rating"},
+            ],
+        },
+    }
+    assert index_names(plan) == ["brand_price_rating", "price_rating"]
+    assert index_names({"stage": "COLLSCAN"}) == []
+
+
+def test_every_query_shape_has_a_declared_index():
+    declared = {(index.collection, index.name) for index in INDEXES}
+    for collection, _, expected in QUERY_SHAPES:
+        assert (collection, expected) in declared
+
+
+def test_fingerprint_is_stable():
+    assert schema_fingerprint() == schema_fingerprint()
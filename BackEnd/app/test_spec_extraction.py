@@ -0,0 +1,180 @@
+import pytest
+from spec_extraction import ALL, FLAG, FieldRule, SpecExtractor, VendorProfile
+from spec_profiles import get_extractor
+
+LENOVO_TEXT = """ThinkPad E14 Gen 5 (Intel)
+Processor Family 13th Generation Intel® Core™ i5 / i7 Processor
+Core i5-1335U, 10C (2P + 8E) / 12T
+Core i7-1355U, 10C (2P + 8E) / 12T
+Core i5-1335U, vPro® Essentials
+Max Memory Up to 40GB DDR4-3200
+Display 14" WUXGA (1920x1200) IPS 300nits Anti-glare
+Ports USB 3.2 Gen 1 Type-A
+HDMI® 2.1, up to 4K/60Hz
+Security TPM 2.0; touch style fingerprint reader; Windows® Hello"""
+
+HP_TEXT = """HP ProBook 450 G10 Notebook PC
+Processor family
+13th Generation Intel® Core™ i7 processor
+Available Processors
+Intel® Core™ i7-1355U; Intel® Core™ i5-1335U
+Intel® Pentium® processor
+15.6" diagonal, FHD (1920 x 1080), IPS
+USB Type-C® 10Gbps
+Made with Recycled plastics"""
+
+
+def test_lenovo_profile_extracts_fields():
+    specs = get_extractor("lenovo").extract(LENOVO_TEXT)
+
+    assert specs["processor_family"] == "13th Generation Intel® Core™ i5 / i7 Processor"
+    assert specs["processor_models"] == ["Core i5-1335U", "Core i7-1355U"]
+    assert specs["max_memory"] == "Up to 40GB DDR4-3200"
+    assert specs["display_options"] == ['14" WUXGA (1920x1200) IPS 300nits Anti-glare']
+    assert specs["ports"] == ["USB 3.2 Gen 1 Type-A", "HDMI® 2.1, up to 4K/60Hz"]
+    assert specs["security_chip"] == "TPM 2.0"
+    assert specs["fingerprint_reader"] is True
+    assert specs["windows_hello"] is True
+    assert "mil_certification" not in specs
+
+
+def test_hp_profile_extracts_fields():
+    specs = get_extractor("hp").extract(HP_TEXT)
+
+    assert specs["processor_family"] == "13th Generation Intel® Core™ i7 processor"
+    assert specs["processor_models"] == [
+        "Intel® Core™ i7-1355U",
+        "Intel® Core™ i5-1335U",
+        "Intel Pentium U300",
+    ]
+    assert specs["display_options"] == ['15.6" diagonal, FHD (1920 x 1080), IPS']
+    assert specs["ports"] == ["USB Type-C® 10Gbps"]
+    assert specs["environmental_materials"] == ["Recycled plastics, packaging, low halogen"]
+
+
+def test_flag_values_are_not_shared_between_results():
+    extractor = get_extractor("hp")
+    first = extractor.extract(HP_TEXT)
+    first["environmental_materials"].append("mutated")
+
+    assert extractor.extract(HP_TEXT)["environmental_materials"] == [
+        "Recycled plastics, packaging, low halogen"
+    ]
+
+
+def test_custom_vendor_profile_is_data_only():
+    profile = VendorProfile(
+        name="acme",
+        rules=(
+            FieldRule("weight", r"Weight:\s*([\d.]+ kg)", ("weight:",), ignore_case=True),
+            FieldRule("ports", r"Port: ([^\n]+)", ("port: ",), mode=ALL),
+            FieldRule("security_chip", r"TPM", ("tpm",), mode=FLAG, value="TPM"),
+        ),
+    )
+    specs = SpecExtractor(profile).extract("WEIGHT: 1.2 kg\nPort: USB-C\nPort: HDMI\nno chip here")
+
+    assert specs == {"weight": "1.2 kg", "ports": ["USB-C", "HDMI"]}
+
+
+def test_anchors_must_be_lowercase():
+    with pytest.raises(ValueError):
+        SpecExtractor(VendorProfile("bad", (FieldRule("x", r"X", ("X",)),)))
+
+
+def test_session_stops_once_single_valued_fields_settle():
+    rules = (
+        FieldRule("weight", r"Weight:\s*([\d.]+ kg)", ("weight:",)),
+        FieldRule("color", r"Color: ([^\n]+)", ("color: ",)),
+    )
+    session = SpecExtractor(VendorProfile("acme", rules)).session()
+
+    session.feed("Weight: 1.2 kg")
+    assert not session.complete
+    session.feed("Color: grey")
+    assert session.complete
+    assert session.result() == {"weight": "1.2 kg", "color": "grey"}
+
+
+def test_session_keeps_one_page_and_counts_overlapping_list_matches_once():
+    profile = VendorProfile(
+        "acme",
+        (
+            FieldRule("weight", r"Weight:\s*([\d.]+ kg)", ("weight:",)),
+            FieldRule("ports", r"Port: ([^\n]+)", ("port: ",), mode=ALL),
+            FieldRule("security_chip", r"TPM", ("tpm",), mode=FLAG, append=True, value="TPM"),
+        ),
+    )
+    extractor = SpecExtractor(profile)
+    # The weight value only follows the anchor on the next page
+    pages = ["Port: USB-C\nWeight:", "1.2 kg\nPort: HDMI\nTPM", "Port: HDMI", "TPM"]
+    session = extractor.session()
+    for page in pages:
+        session.feed(page)
+        # A list field can still grow on any later page
+        assert not session.complete
+        assert session._previous == page
+
+    assert session.result() == extractor.extract("\n".join(pages))
+    assert session.result() == {
+        "ports": ["USB-C", "HDMI", "HDMI"],
+        "weight": "1.2 kg",
+        "security_chip": ["TPM"],
+    }
+
+
+def test_session_stops_at_the_page_cap():
+    rules = (FieldRule("ports", r"Port: ([^\n]+)", ("port: ",), mode=ALL),)
+    profile = VendorProfile("acme", rules, max_pages=2)
+    pages = iter(["Port: USB-C", "Port: HDMI", "Port: RJ-45"])
+
+    assert SpecExtractor(profile).extract_pages(pages) == {"ports": ["USB-C", "HDMI"]}
+    assert next(pages) == "Port: RJ-45"
+
+
+# Datasheet text split the way pdfplumber pages it: a multi-line field crosses a
+# page break, and list values and security flags only show up on later pages
+MULTI_PAGE_SHEETS = {
+    "hp": [
+        "HP ProBook 450 G10 Notebook PC\nProcessor family\n13th Generation Intel® Core™ i7 processor",
+        "Available Processors\nIntel® Core™ i7-1355U; Intel® Core™ i5-1335U\n"
+        '15.6" diagonal, FHD (1920 x 1080), IPS\nUSB Type-C® 10Gbps',
+        "Intel® Core™ i5-1345U\nIntel® Pentium® processor\nTPM 2.0 embedded security chip\n"
+        "Fingerprint sensor\nMIL-STD 810H tested\nMade with Recycled plastics",
+    ],
+    "lenovo": [
+        "ThinkPad E14 Gen 5 (Intel)\nProcessor Family 13th Generation Intel® Core™ i5 / i7 Processor\n"
+        "Core i5-1335U, 10C (2P + 8E) / 12T\nMax Memory Up to 40GB DDR4-3200",
+        'Core i7-1355U, 10C (2P + 8E) / 12T\nDisplay 14" WUXGA (1920x1200) IPS 300nits Anti-glare',
+        '14" 2.2K (2240x1400) IPS 300nits Anti-glare\n'
+        "Security TPM 2.0; touch style fingerprint reader; Windows® Hello",
+    ],
+}
+
+
+@pytest.mark.parametrize("vendor", sorted(MULTI_PAGE_SHEETS))
+def test_page_by_page_extraction_matches_a_full_parse(vendor):
+    extractor = get_extractor(vendor)
+    pages = MULTI_PAGE_SHEETS[vendor]
+    full = extractor.extract("\n".join(pages))
+
+    assert extractor.extract_pages(iter(pages)) == full
+    assert full["security_chip"] == "TPM 2.0"
+    assert full["fingerprint_reader"] is True
+    assert len(full["processor_models"]) >= 2
+    if vendor == "hp":
+        assert full["processor_family"] == "13th Generation Intel® Core™ i7 processor"
+
+
+@pytest.mark.parametrize("sku", ["hp_probook_450_g10", "lenovo_thinkpad_e14_intel"])
+def test_real_datasheet_page_extraction_matches_a_full_parse(sku):
+    pytest.importorskip("pdfplumber")
+    from pdf_cache import pdf_cache
+    from pdf_parser import CANONICAL_PDFS, PDFParser, brand_for_sku
+
+    pdf = pdf_cache.lookup(CANONICAL_PDFS[sku])
+    if pdf is None:
+        pytest.skip("datasheet not in the local PDF cache")
+    extractor = get_extractor(brand_for_sku(sku))
+    full = extractor.extract(PDFParser.extract_text(pdf.path))
+
+    assert PDFParser.parse_with_profile(pdf.path, brand_for_sku(sku)) == full
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+from summary_cache import SummaryCache, summary_key
+
+
+class MemoryCollection:
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = dict(doc, _id=query["_id"])
+
+    async def delete_many(self, query):
+        for key in [k for k, doc in self.docs.items() if query["skus"] in doc["skus"]]:
+            del self.docs[key]
+
+
+class YieldingCollection(MemoryCollection):
+    """Like a real driver, lookups give other tasks a chance to run."""
+
+    async def find_one(self, query):
+        await asyncio.sleep(0)
+        return await super().find_one(query)
+
+
+class LocalSummaryCache(SummaryCache):
+    def __init__(self, collection, **kwargs):
+        super().__init__(**kwargs)
+        self._collection = collection
+
+    @property
+    def collection(self):
+        return self._collection
+
+
+class CountingLLM:
+    SUMMARY_PROMPT_VERSION = 1
+
+    def __init__(self):
+        self.calls = 0
+
+    async def summarize_text(self, text):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return f"summary {self.calls}"
+
+
+RESULTS = [
+    {"sku": "b", "current_price": 900.0, "last_updated": datetime(2024, 1, 1)},
+    {"sku": "a", "current_price": 1100.0},
+]
+
+
+def test_key_ignores_order_and_volatile_fields_but_not_prompt_version():
+    reordered = [dict(RESULTS[1]), dict(RESULTS[0], last_updated=datetime(2024, 6, 1))]
+
+    assert summary_key(RESULTS, 1) == summary_key(reordered, 1)
+    assert summary_key(RESULTS, 1) != summary_key(RESULTS, 2)
+    assert summary_key(RESULTS, 1) != summary_key([dict(RESULTS[0], current_price=1.0), RESULTS[1]], 1)
+
+
+@pytest.mark.asyncio
+async def test_repeats_and_concurrent_misses_share_one_llm_call():
+    llm = CountingLLM()
+    cache = LocalSummaryCache(MemoryCollection())
+
+    first, second = await asyncio.gather(cache.summarize(RESULTS, llm), cache.summarize(RESULTS, llm))
+    assert first == second == "summary 1"
+    assert await cache.summarize(RESULTS, llm) == "summary 1"
+    assert llm.calls == 1
+    assert cache.hits["memory"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call_when_lookup_yields():
+    llm = CountingLLM()
+    cache = LocalSummaryCache(YieldingCollection())
+
+    results = await asyncio.gather(*(cache.summarize(RESULTS, llm) for _ in range(3)))
+    assert results == ["summary 1"] * 3
+    assert llm.calls == 1
+    assert cache._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_mongo_tier_is_shared_and_product_writes_invalidate():
+    llm = CountingLLM()
+    collection = MemoryCollection()
+    await LocalSummaryCache(collection).summarize(RESULTS, llm)
+
+    other_worker = LocalSummaryCache(collection)
+    assert await other_worker.summarize(RESULTS, llm) == "summary 1"
+    assert other_worker.hits["mongo"] == 1
+
+    other_worker.apply_write("a", {"current_price": 1000.0})
+    await asyncio.gather(*other_worker._tasks)
+    assert collection.docs == {}
+    assert await other_worker.summarize(RESULTS, llm) == "summary 2"
+
+
+@pytest.mark.asyncio
+async def test_mongo_entry_age_is_read_as_utc_on_non_utc_hosts(monkeypatch):
+    monkeypatch.setenv("TZ", "Asia/Colombo")
+    time.tzset()
+    try:
+        collection = MemoryCollection()
+        await LocalSummaryCache(collection).put("k", "summary", ("a",), 1)
+
+        other_worker = LocalSummaryCache(collection)
+        assert await other_worker.get("k") == "summary"
+        assert abs(other_worker._lru["k"][0] - time.time()) < 60
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from text_index import TextIndex, flatten_text, reciprocal_rank_fusion, tokenize
+
+
+def make_index():
+    index = TextIndex()
+    index.upsert(
+        "thinkpad_e14",
+        {
+            "canonical_name": "Thinkpad E14 Gen 5",
+            "technical_specs": {"processor_models": ["Core i7-1355U"], "fingerprint_reader": True},
+            "current_price": 900.0,
+            "brand": "lenovo",
+        },
+    )
+    index.upsert(
+        "probook_450",
+        {
+            "canonical_name": "HP ProBook 450 G10",
+            "technical_specs": {"graphics_options": ["NVIDIA® GeForce RTX™ 2050"]},
+            "current_price": 1100.0,
+            "brand": "hp",
+        },
+    )
+    return index
+
+
+def test_tokenize_and_flatten_specs():
+    assert tokenize("Core™ i7-1355U") == ["core", "i7", "1355u"]
+    text = flatten_text({"ports": ["USB-C", "HDMI"], "fingerprint_reader": True})
+    assert tokenize(text) == ["ports", "usb", "c", "hdmi", "fingerprint", "reader"]
+
+
+def test_bm25_ranks_matching_products_with_filters():
+    index = make_index()
+
+    assert [sku for sku, _ in index.search("rtx gaming laptop")] == ["probook_450"]
+    assert [sku for sku, _ in index.search("thinkpad i7")] == ["thinkpad_e14"]
+    assert index.search("rtx", brands=["lenovo"]) == []
+    assert index.search("thinkpad", max_price=800.0) == []
+
+
+def test_updates_reindex_incrementally():
+    index = make_index()
+    index.apply_write("probook_450", {"specs_live": {"processor": "Core i7-1355U"}})
+    index.apply_write("thinkpad_e14", {"current_price": 700.0})
+
+    assert {sku for sku, _ in index.search("1355u")} == {"thinkpad_e14", "probook_450"}
+    assert [sku for sku, _ in index.search("rtx")] == ["probook_450"]
+    assert [sku for sku, _ in index.search("thinkpad", max_price=800.0)] == ["thinkpad_e14"]
+
+    index.remove("probook_450")
+    assert index.search("rtx") == []
+    assert len(index) == 1
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "a"]])
+
+    assert [sku for sku, _ in fused][0] == "b"
+
+
+@pytest.mark.asyncio
+async def test_writes_during_a_background_load_survive_the_swap():
+    class SlowCollection:
+        async def _iterate(self):
+            await asyncio.sleep(0)
+            yield {"sku": "thinkpad_e14", "canonical_name": "Thinkpad E14", "current_price": 900.0}
+
+        def find(self, query, projection):
+            return self._iterate()
+
+    index = TextIndex()
+    load = asyncio.create_task(index.load(SlowCollection()))
+    await asyncio.sleep(0)
+    index.apply_write("probook_450", {"canonical_name": "HP ProBook 450", "current_price": 1100.0})
+    await load
+
+    assert [sku for sku, _ in index.search("probook")] == ["probook_450"]
+    assert [sku for sku, _ in index.search("thinkpad")] == ["thinkpad_e14"]
+
+
+@pytest.mark.asyncio
+async def test_failed_load_stops_buffering_writes():
+    class BrokenCollection:
+        async def _iterate(self):
+            await asyncio.sleep(0)
+            raise ConnectionError("cursor killed")
+            yield
+
+        def find(self, query, projection):
+            return self._iterate()
+
+    index = make_index()
+    with pytest.raises(ConnectionError):
+        await index.load(BrokenCollection())
+    index.apply_write("probook_450", {"current_price": 999.0})
+
+    assert index._replay is None
+    assert len(index) == 2
@@ -0,0 +1,98 @@
+import asyncio
+
+import numpy as np
+import pytest
+from vector_index import VectorIndex
+
+
+def make_index():
+    index = VectorIndex(initial_capacity=1)
+    index.upsert("lenovo_a", [1.0, 0.0, 0.0], price=800.0, brand="lenovo")
+    index.upsert("lenovo_b", [0.7, 0.7, 0.0], price=1200.0, brand="lenovo")
+    index.upsert("hp_a", [0.9, 0.1, 0.0], price=950.0, brand="hp")
+    index.upsert("hp_b", [0.0, 0.0, 1.0], price=700.0, brand="hp")
+    return index
+
+
+def test_search_ranks_by_cosine_similarity():
+    hits = make_index().search([1.0, 0.0, 0.0], k=3)
+
+    assert [sku for sku, _ in hits] == ["lenovo_a", "hp_a", "lenovo_b"]
+    assert hits[0][1] == pytest.approx(1.0)
+
+
+def test_filters_are_applied_before_top_k():
+    index = make_index()
+
+    assert [s for s, _ in index.search([1.0, 0.0, 0.0], k=2, max_price=1000.0, brands=["hp"])] == [
+        "hp_a",
+        "hp_b",
+    ]
+    assert index.search([1.0, 0.0, 0.0], min_price=5000.0) == []
+
+
+def test_writes_update_rows_in_place():
+    index = make_index()
+    index.apply_write("hp_b", {"embedding": [1.0, 0.0, 0.0], "current_price": 650.0})
+    index.apply_write("lenovo_a", {"current_price": 2000.0})
+    index.remove("hp_a")
+
+    assert len(index) == 3
+    assert "hp_a" not in index
+    hits = index.search([1.0, 0.0, 0.0], k=1, max_price=1000.0)
+    assert hits[0][0] == "hp_b"
+    assert np.isclose(hits[0][1], 1.0)
+
+
+def test_dimension_mismatch_is_rejected():
+    with pytest.raises(ValueError):
+        make_index().upsert("bad", [1.0, 0.0])
+
+
+class SlowCollection:
+    """Yields stored documents one event-loop turn at a time, like a driver cursor."""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def _iterate(self):
+        for doc in self.docs:
+            await asyncio.sleep(0)
+            yield doc
+
+    def find(self, query, projection):
+        return self._iterate()
+
+
+@pytest.mark.asyncio
+async def test_writes_during_a_background_load_survive_the_swap():
+    index = VectorIndex()
+    stored = [{"sku": "a", "embedding": [1.0, 0.0], "current_price": 900.0, "brand": "hp"}]
+    load = asyncio.create_task(index.load(SlowCollection(stored)))
+    await asyncio.sleep(0)
+    index.apply_write("b", {"embedding": [0.0, 1.0], "current_price": 1100.0, "brand": "lenovo"})
+    await load
+
+    assert "a" in index and "b" in index
+    assert index.search([0.0, 1.0], k=1)[0][0] == "b"
+    assert index._replay is None
+
+
+@pytest.mark.asyncio
+async def test_failed_load_stops_buffering_writes():
+    class BrokenCollection:
+        async def _iterate(self):
+            await asyncio.sleep(0)
+            raise ConnectionError("cursor killed")
+            yield
+
+        def find(self, query, projection):
+            return self._iterate()
+
+    index = VectorIndex()
+    with pytest.raises(ConnectionError):
+        await index.load(BrokenCollection())
+    index.apply_write("a", {"embedding": [1.0, 0.0]})
+
+    assert index._replay is None
+    assert "a" in index
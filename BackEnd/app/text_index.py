@@ -0,0 +1,179 @@
+import math
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from database import mongodb
+
+# Product fields whose text is indexed
+TEXT_FIELDS = ("canonical_name", "technical_specs", "specs_live")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def flatten_text(value: Any) -> str:
+    """All string-ish leaves of a (nested) spec value, space-separated."""
+    if value is None or isinstance(value, bool):
+        return ""
+    if isinstance(value, dict):
+        return " ".join(f"{key.replace('_', ' ')} {flatten_text(v)}" for key, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return " ".join(flatten_text(v) for v in value)
+    return str(value)
+
+
+class TextIndex:
+    """
+    In-memory inverted index with Okapi BM25 scoring.
+
+    Postings map term -> {sku: term frequency}. A product is re-indexed by
+    removing its previous term counts and adding the new ones, so updates cost
+    the size of that product's text rather than a rebuild.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._terms: Dict[str, Counter] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._prices: Dict[str, float] = {}
+        self._brands: Dict[str, str] = {}
+        self.loaded_at: Optional[float] = None
+        # Writes seen while a load is scanning the catalog, replayed onto the rebuilt index
+        self._replay: Optional[List[Tuple[str, dict]]] = None
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, sku: str) -> bool:
+        return sku in self._terms
+
+    def _unindex(self, sku: str):
+        terms = self._terms.pop(sku, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[sku]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(sku)
+
+    def upsert(self, sku: str, fields: Dict[str, Any]):
+        """(Re)index a product from whichever TEXT_FIELDS `fields` carries."""
+        sources = self._sources.setdefault(sku, {})
+        sources.update({name: fields[name] for name in TEXT_FIELDS if name in fields})
+        if fields.get("current_price") is not None:
+            self._prices[sku] = fields["current_price"]
+        if fields.get("brand") is not None:
+            self._brands[sku] = fields["brand"]
+
+        self._unindex(sku)
+        terms = Counter(tokenize(" ".join(flatten_text(sources.get(name)) for name in TEXT_FIELDS)))
+        self._terms[sku] = terms
+        self._lengths[sku] = sum(terms.values())
+        self._total_length += self._lengths[sku]
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[sku] = count
+
+    def remove(self, sku: str):
+        self._unindex(sku)
+        self._sources.pop(sku, None)
+        self._prices.pop(sku, None)
+        self._brands.pop(sku, None)
+
+    def apply_write(self, sku: str, fields: dict):
+        """Product-writer listener: re-index text changes, track price/brand otherwise."""
+        if self._replay is not None:
+            self._replay.append((sku, fields))
+        if any(name in fields for name in TEXT_FIELDS):
+            self.upsert(sku, fields)
+            return
+        if fields.get("current_price") is not None:
+            self._prices[sku] = fields["current_price"]
+        if fields.get("brand") is not None:
+            self._brands[sku] = fields["brand"]
+
+    def _allowed(
+        self, sku: str, min_price: Optional[float], max_price: Optional[float], brands: Optional[set]
+    ) -> bool:
+        price = self._prices.get(sku)
+        if min_price is not None and (price is None or price < min_price):
+            return False
+        if max_price is not None and (price is None or price > max_price):
+            return False
+        return not brands or self._brands.get(sku) in brands
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        brands: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Top-k (sku, BM25 score) pairs among products passing the filters."""
+        n = len(self._terms)
+        if n == 0 or k <= 0:
+            return []
+        brand_set = set(brands) if brands else None
+        average_length = self._total_length / n or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for sku, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[sku] / average_length)
+                scores[sku] = scores.get(sku, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(
+            (
+                (sku, score)
+                for sku, score in scores.items()
+                if self._allowed(sku, min_price, max_price, brand_set)
+            ),
+            key=lambda hit: hit[1],
+            reverse=True,
+        )
+        return ranked[:k]
+
+    async def load(self, collection=None):
+        """(Re)build the index from every product in the catalog."""
+        collection = collection if collection is not None else mongodb.database.products
+        started = time.perf_counter()
+        self._replay = []
+        fresh = TextIndex(self.k1, self.b)
+        projection = {"_id": 0, "sku": 1, "current_price": 1, "brand": 1}
+        projection.update({name: 1 for name in TEXT_FIELDS})
+        try:
+            async for doc in collection.find({}, projection):
+                fresh.upsert(doc["sku"], doc)
+            for sku, fields in self._replay:
+                fresh.apply_write(sku, fields)
+        finally:
+            # Also on failure, or later writes would keep piling up in the buffer
+            self._replay = None
+        self.__dict__.update(fresh.__dict__)
+        self.loaded_at = time.time()
+        print(f"Text index loaded {len(self)} products in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse several ranked sku lists: score = sum(1 / (k + rank))."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, sku in enumerate(ranking, start=1):
+            scores[sku] = scores.get(sku, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda hit: hit[1], reverse=True)
+
+
+text_index = TextIndex()
@@ -1,17 +1,18 @@
 from typing import Optional
-import json
 from google.adk.tools import FunctionTool
 from utils import update_interaction_history
-from services import MongoSessionService
+from services import get_session_service
 
 
-from database import mongodb
+from product_search import search_products
+from summary_cache import summary_cache
 
 
 def get_llm_service():
-    from llm_service import LLMService
+    # Imported lazily: llm_service imports this module to register the tool
+    from llm_service import get_llm_service as shared_llm_service
 
-    return LLMService()
+    return shared_llm_service()
 
 
 def replace_none_with_missing(data: dict) -> dict:
@@ -35,7 +36,7 @@ async def search_products_tool_function(
     max_price: Optional[float] = None,
 ) -> dict:
     """
-    Search products using MongoDB Atlas Search index and optional price filtering.
+    Hybrid keyword and semantic product search with optional price filtering.
     Also summarize the results using the LLM service.
 
     Args:
@@ -55,9 +56,7 @@ async def search_products_tool_function(
             "user_id": user_id,
             "session_id": session_id,
         }
-        db = mongodb.database
-        session_collection = db["ChatSessions"]
-        session_service = MongoSessionService(collection=session_collection)
+        session_service = get_session_service()
         print("session id ,", session_id, user_id, app_name)
         current_session = await session_service.get_session(
             app_name=app_name, user_id=user_id, session_id=session_id
@@ -75,42 +74,11 @@ async def search_products_tool_function(
         print(
             f"[Utils] Searching products with query: {query}, min_price: {min_price}, max_price: {max_price}"
         )
-        pipeline = [
-            # {
-            #     "$search": {
-            #         "index": "default",
-            #         "text": {"query": query, "path": {"wildcard": "*"}},
-            #     }
-            # }
-        ]
-        print("price arnge ", min_price, max_price)
-
-        price_filter = {}
-        if min_price is not None:
-            price_filter["$gte"] = float(min_price)
-        if max_price is not None:
-            price_filter["$lte"] = float(max_price)
-
-        if price_filter:
-            pipeline.append({"$match": {"current_price": price_filter}})
-
-        pipeline.append({"$project": {"_id": 0, "embedding": 0}})
-        pipeline.append({"$limit": 10})
-
-        cursor = mongodb.database.products.aggregate(pipeline)
-        results = await cursor.to_list(length=10)
-
-        for doc in results:
-            specs = doc.get("technical_specs", {})
-            for field in ["weight", "memory", "processor"]:
-                if field in specs and isinstance(specs[field], list):
-                    specs[field] = specs[field][0]
-            doc["technical_specs"] = specs
-
         llm_service = get_llm_service()
-        raw_data = json.dumps(results, indent=2)
-        print("raw data", raw_data)
-        summary = await llm_service.summarize_text(raw_data)
+        results = await search_products(
+            query, llm_service, limit=10, min_price=min_price, max_price=max_price
+        )
+        summary = await summary_cache.summarize(results, llm_service)
 
         print("summary:", summary)
         print("Updating price range in session state for user_id:")
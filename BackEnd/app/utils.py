@@ -1,6 +1,8 @@
 from datetime import datetime
+import json
 import types
 from google.genai.types import Content, Part
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.sessions import InMemorySessionService
 import asyncio
 
@@ -177,3 +179,55 @@ async def call_agent_async(runner, user_id, session_id, query):
 
 
     return  final_response_text if final_response_text else "No response generated."
+
+
+def format_sse(event: str, data) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_agent_events(runner, user_id, session_id, query):
+    """
+    Runs the ADK agent in streaming mode and yields (event, data) pairs:
+    tool_start / tool_end around tool calls, token for partial text and a
+    final answer, which is also added to the interaction history.
+    """
+    content = Content(role="user", parts=[Part(text=query)])
+    final_response_text = None
+    agent_name = None
+
+    async with AGENT_CALL_SEMAPHORE:
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=content,
+            run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+        ):
+            if event.author:
+                agent_name = event.author
+
+            for call in event.get_function_calls():
+                yield "tool_start", {"tool": call.name, "args": call.args or {}}
+            for response in event.get_function_responses():
+                yield "tool_end", {"tool": response.name}
+
+            if event.partial:
+                for part in (event.content.parts if event.content else None) or []:
+                    if getattr(part, "text", None):
+                        yield "token", {"text": part.text}
+                continue
+
+            response = await process_agent_response(event)
+            if response:
+                final_response_text = response
+
+    if final_response_text and agent_name:
+        await add_agent_response_to_history(
+            session_service=runner.session_service,
+            app_name=runner.app_name,
+            user_id=user_id,
+            session_id=session_id,
+            agent_name=agent_name,
+            response_text=final_response_text
+        )
+    yield "final", {"answer": final_response_text or "No response generated."}
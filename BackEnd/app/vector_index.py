@@ -0,0 +1,168 @@
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from database import mongodb
+
+
+class VectorIndex:
+    """
+    In-memory cosine-similarity index over product embeddings.
+
+    Embeddings are kept L2-normalized in one float32 matrix, so a query is a
+    single matrix-vector product. Price and brand live in parallel arrays and
+    are applied as boolean masks before the top-k selection. Rows are updated
+    in place as products are written; deleted rows are swapped with the last.
+    """
+
+    def __init__(self, initial_capacity: int = 256):
+        self.dim: Optional[int] = None
+        self._capacity = initial_capacity
+        self._matrix: Optional[np.ndarray] = None
+        self._prices = np.zeros(initial_capacity, dtype=np.float64)
+        self._brands = np.empty(initial_capacity, dtype=object)
+        self._skus: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.loaded_at: Optional[float] = None
+        # Writes seen while a load is scanning the catalog, replayed onto the rebuilt index
+        self._replay: Optional[List[Tuple[str, dict]]] = None
+
+    def __len__(self) -> int:
+        return len(self._skus)
+
+    def __contains__(self, sku: str) -> bool:
+        return sku in self._rows
+
+    def _grow(self, needed: int):
+        if self._matrix is not None and needed <= self._capacity:
+            return
+        capacity = max(self._capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        prices = np.zeros(capacity, dtype=np.float64)
+        brands = np.empty(capacity, dtype=object)
+        n = len(self._skus)
+        if self._matrix is not None:
+            matrix[:n] = self._matrix[:n]
+        prices[:n] = self._prices[:n]
+        brands[:n] = self._brands[:n]
+        self._matrix, self._prices, self._brands = matrix, prices, brands
+        self._capacity = capacity
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def upsert(self, sku: str, embedding: Sequence[float], price: Optional[float] = None, brand: Optional[str] = None):
+        if self.dim is None:
+            self.dim = len(embedding)
+        if len(embedding) != self.dim:
+            raise ValueError(f"Embedding for {sku} has {len(embedding)} dims, index has {self.dim}")
+
+        row = self._rows.get(sku)
+        if row is None:
+            row = len(self._skus)
+            self._grow(row + 1)
+            self._skus.append(sku)
+            self._rows[sku] = row
+        self._matrix[row] = self._normalize(embedding)
+        self.update_attributes(sku, price=price, brand=brand)
+
+    def update_attributes(self, sku: str, price: Optional[float] = None, brand: Optional[str] = None):
+        row = self._rows.get(sku)
+        if row is None:
+            return
+        if price is not None:
+            self._prices[row] = price
+        if brand is not None:
+            self._brands[row] = brand
+
+    def remove(self, sku: str):
+        row = self._rows.pop(sku, None)
+        if row is None:
+            return
+        last = len(self._skus) - 1
+        if row != last:
+            moved = self._skus[last]
+            self._matrix[row] = self._matrix[last]
+            self._prices[row] = self._prices[last]
+            self._brands[row] = self._brands[last]
+            self._skus[row] = moved
+            self._rows[moved] = row
+        self._skus.pop()
+
+    def apply_write(self, sku: str, fields: dict):
+        """Product-writer listener: keep rows in step with stored products."""
+        if self._replay is not None:
+            self._replay.append((sku, fields))
+        if fields.get("embedding"):
+            self.upsert(sku, fields["embedding"], fields.get("current_price"), fields.get("brand"))
+        else:
+            self.update_attributes(sku, fields.get("current_price"), fields.get("brand"))
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int = 10,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        brands: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Top-k (sku, cosine score) pairs among products passing the filters."""
+        n = len(self._skus)
+        if n == 0 or k <= 0:
+            return []
+        scores = self._matrix[:n] @ self._normalize(query)
+
+        mask = np.ones(n, dtype=bool)
+        if min_price is not None:
+            mask &= self._prices[:n] >= min_price
+        if max_price is not None:
+            mask &= self._prices[:n] <= max_price
+        if brands:
+            mask &= np.isin(self._brands[:n], list(brands))
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return []
+
+        candidate_scores = scores[candidates]
+        if candidates.size > k:
+            top = np.argpartition(-candidate_scores, k - 1)[:k]
+        else:
+            top = np.arange(candidates.size)
+        top = top[np.argsort(-candidate_scores[top])]
+        return [(self._skus[candidates[i]], float(candidate_scores[i])) for i in top]
+
+    async def load(self, collection=None):
+        """(Re)build the index from every product that has an embedding."""
+        collection = collection if collection is not None else mongodb.database.products
+        started = time.perf_counter()
+        self._replay = []
+        fresh = VectorIndex(self._capacity)
+        try:
+            async for doc in collection.find(
+                {"embedding": {"$type": "array"}},
+                {"_id": 0, "sku": 1, "embedding": 1, "current_price": 1, "brand": 1},
+            ):
+                try:
+                    fresh.upsert(doc["sku"], doc["embedding"], doc.get("current_price"), doc.get("brand"))
+                except ValueError as e:
+                    print(f"Skipping embedding: {e}")
+            for sku, fields in self._replay:
+                try:
+                    fresh.apply_write(sku, fields)
+                except ValueError as e:
+                    print(f"Skipping replayed write for {sku}: {e}")
+        finally:
+            # Also on failure, or later writes would keep piling up in the buffer
+            self._replay = None
+        self.__dict__.update(fresh.__dict__)
+        self.loaded_at = time.time()
+        print(f"Vector index loaded {len(self)} products in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+vector_index = VectorIndex()